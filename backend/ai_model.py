@@ -3,14 +3,20 @@ AI Model Integration
 Kimi K2AI model for price prediction
 """
 
+import copy
 import numpy as np
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional
 import torch
 import torch.nn as nn
 from transformers import AutoModel, AutoTokenizer
 from schema import PriceCandle, Prediction
+from soa import candles_to_soa
+
+# Input shape is fixed at (1, sequence_length, 5), so let cuDNN benchmark
+# and cache the fastest LSTM algorithm for it
+torch.backends.cudnn.benchmark = True
 
 
 class SimpleLSTMModel(nn.Module):
@@ -62,6 +68,28 @@ class KimiK2AIModel:
         self.lstm_model = SimpleLSTMModel(input_size=5, hidden_size=64, num_layers=2)
         self.lstm_model.to(self.device)
         self.lstm_model.eval()
+
+        # Scripted copy of the model used for inference (built in load_model)
+        self.inference_model = self.lstm_model
+
+        # ONNX Runtime session used as the CPU fast path (built in load_model)
+        self.ort_session = None
+
+        # Frontend polling hits predict far more often than new bars
+        # arrive; cache the heavy (return, confidence) computation per bar
+        self._prediction_cache = {}  # key -> (predicted_return, confidence, cached_at)
+        self._prediction_cache_ttl = timedelta(seconds=30)
+        self._prediction_cache_max = 256
+
+        # Reusable input buffer so each prediction avoids a fresh tensor
+        # alloc (and a pageable host->device copy on CUDA)
+        self._input_buffer = torch.empty(
+            (1, self.sequence_length, 5), dtype=torch.float32, device=self.device
+        )
+        if self.device.type == "cuda":
+            self._pinned_buffer = torch.empty_like(self._input_buffer, device="cpu").pin_memory()
+        else:
+            self._pinned_buffer = None
     
     def load_model(self, model_path: Optional[str] = None):
         """
@@ -101,13 +129,82 @@ class KimiK2AIModel:
                     print("⚠ No trained model found. Using untrained model (random weights).")
                     print("  Run train_model.py to train the model first.")
             
+            self._prepare_inference_model()
             self.is_loaded = True
             return True
         except Exception as e:
             print(f"Error loading model: {e}")
             print("Using untrained model (random weights)")
+            self._prepare_inference_model()
             self.is_loaded = True
             return False
+
+    def _prepare_inference_model(self):
+        """
+        Script the model once and warm it up
+
+        TorchScript fuses the per-op dispatch of the eager LSTM, and two
+        dummy forwards trigger JIT specialization so the first real
+        prediction doesn't pay the compile cost. Keeps self.lstm_model
+        eager so checkpoints can still be loaded into it.
+        """
+        try:
+            model = self.lstm_model
+            if self.device.type == "cuda":
+                # Half precision doubles tensor-core throughput on the
+                # LSTM matmuls; the eager FP32 model is kept for training
+                model = copy.deepcopy(model).half()
+                self._input_buffer = self._input_buffer.half()
+                self._pinned_buffer = self._pinned_buffer.half().pin_memory()
+
+            scripted = torch.jit.script(model)
+            scripted = torch.jit.optimize_for_inference(scripted)
+
+            # Warm up: run twice so profiling + optimized paths both compile
+            dummy = torch.zeros_like(self._input_buffer)
+            with torch.inference_mode():
+                scripted(dummy)
+                scripted(dummy)
+
+            self.inference_model = scripted
+        except Exception as e:
+            print(f"Model scripting failed, falling back to eager mode: {e}")
+            self.inference_model = self.lstm_model
+
+        if self.device.type == "cpu":
+            self._build_ort_session()
+
+    def _build_ort_session(self):
+        """
+        Export the LSTM to ONNX and serve it via ONNX Runtime on CPU
+
+        ORT's graph optimizer fuses the LSTM considerably better than
+        eager PyTorch on CPU. The session is optional: any failure
+        (missing onnxruntime, export issue) falls back to TorchScript.
+        """
+        try:
+            import tempfile
+            import onnxruntime
+
+            onnx_path = os.path.join(tempfile.gettempdir(), "kimi_k2ai_lstm.onnx")
+            torch.onnx.export(
+                self.lstm_model,
+                torch.zeros(1, self.sequence_length, 5),
+                onnx_path,
+                opset_version=17,
+                input_names=["x"],
+                output_names=["y"]
+            )
+
+            sess_options = onnxruntime.SessionOptions()
+            sess_options.graph_optimization_level = \
+                onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self.ort_session = onnxruntime.InferenceSession(
+                onnx_path, sess_options, providers=["CPUExecutionProvider"]
+            )
+        except Exception as e:
+            print(f"ONNX Runtime unavailable, using TorchScript on CPU: {e}")
+            self.ort_session = None
     
     def prepare_features(self, candles: List[PriceCandle]) -> np.ndarray:
         """
@@ -122,48 +219,91 @@ class KimiK2AIModel:
         """
         if len(candles) < 2:
             return np.array([])
-        
-        features = []
-        prices = [c.close for c in candles]
-        
-        for i in range(len(candles)):
-            candle = candles[i]
-            
-            # Normalize price (using first price as reference)
-            normalized_price = candle.close / prices[0] if prices[0] > 0 else 1.0
-            
-            # Normalized volume
-            volumes = [c.volume for c in candles]
-            if volumes:
-                normalized_volume = candle.volume / max(volumes) if max(volumes) > 0 else 0.0
-            else:
-                normalized_volume = 0.0
-            
-            # High-Low spread (normalized)
-            spread = (candle.high - candle.low) / candle.close if candle.close > 0 else 0.0
-            
-            # Price change
-            if i > 0:
-                price_change = (candle.close - candles[i-1].close) / candles[i-1].close
-            else:
-                price_change = 0.0
-            
-            # Returns
-            if i > 0:
-                returns = np.log(candle.close / candles[i-1].close) if candles[i-1].close > 0 else 0.0
-            else:
-                returns = 0.0
-            
-            features.append([
-                normalized_price,
-                normalized_volume,
-                spread,
-                price_change,
-                returns
-            ])
-        
-        return np.array(features)
-    
+
+        # Extract OHLCV columns once (structure-of-arrays) instead of
+        # re-scanning the candle list per row
+        soa = candles_to_soa(candles)
+        return self._features_from_soa(
+            soa['close'], soa['high'], soa['low'], soa['volume']
+        )
+
+    def _features_from_soa(
+        self,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        volume: np.ndarray
+    ) -> np.ndarray:
+        """Build the feature matrix from raw OHLCV column arrays"""
+        n = close.size
+        if n < 2:
+            return np.array([])
+
+        # Normalize price (using first price as reference)
+        normalized_price = close / close[0] if close[0] > 0 else np.ones(n)
+
+        # Normalized volume
+        max_volume = volume.max()
+        normalized_volume = volume / max_volume if max_volume > 0 else np.zeros(n)
+
+        # High-Low spread (normalized)
+        spread = np.where(close > 0, (high - low) / close, 0.0)
+
+        # Price change
+        price_change = np.empty(n)
+        price_change[0] = 0.0
+        price_change[1:] = np.diff(close) / close[:-1]
+
+        # Log returns
+        returns = np.empty(n)
+        returns[0] = 0.0
+        returns[1:] = np.log(close[1:] / close[:-1])
+
+        return np.column_stack([
+            normalized_price,
+            normalized_volume,
+            spread,
+            price_change,
+            returns
+        ]).astype(np.float32)
+
+    def _run_inference(self, features: np.ndarray) -> float:
+        """
+        Pad/slice a feature matrix to the model window and run one forward
+
+        Returns the predicted return as a percentage, clamped to ±10%.
+        """
+        if len(features) < self.sequence_length:
+            # Pad with zeros or repeat last values
+            padding = np.tile(features[-1:], (self.sequence_length - len(features), 1))
+            features = np.vstack([padding, features])
+        else:
+            # Take last sequence_length samples
+            features = features[-self.sequence_length:]
+
+        features = np.ascontiguousarray(features, dtype=np.float32)
+
+        if self.ort_session is not None:
+            # CPU fast path through ONNX Runtime
+            out = self.ort_session.run(None, {"x": features[None]})[0]
+            return float(np.clip(out.reshape(-1)[0], -0.1, 0.1) * 100.0)
+
+        # Copy into the preallocated input buffer instead of building a
+        # new tensor per call
+        if self._pinned_buffer is not None:
+            self._pinned_buffer[0].copy_(torch.from_numpy(features))
+            self._input_buffer.copy_(self._pinned_buffer, non_blocking=True)
+        else:
+            self._input_buffer[0].copy_(torch.from_numpy(features))
+
+        # Predict (inference_mode also skips autograd version tracking,
+        # unlike no_grad). Clamp to ±10% and convert to percentage on the
+        # device so the single .item() is the only D2H sync.
+        with torch.inference_mode():
+            prediction = self.inference_model(self._input_buffer)
+            prediction = torch.clamp(prediction, -0.1, 0.1) * 100.0
+            return prediction.item()
+
     def predict_next_return(
         self,
         historical_data: List[PriceCandle]
@@ -185,33 +325,15 @@ class KimiK2AIModel:
             return 0.0, 50.0
         
         try:
-            # Prepare features
+            # Prepare features and run one forward
             features = self.prepare_features(historical_data)
-            
-            if len(features) < self.sequence_length:
-                # Pad with zeros or repeat last values
-                padding = np.tile(features[-1:], (self.sequence_length - len(features), 1))
-                features = np.vstack([padding, features])
-            else:
-                # Take last sequence_length samples
-                features = features[-self.sequence_length:]
-            
-            # Convert to tensor
-            features_tensor = torch.FloatTensor(features).unsqueeze(0).to(self.device)
-            
-            # Predict
-            with torch.no_grad():
-                prediction = self.lstm_model(features_tensor)
-                predicted_return = prediction.item()
-            
+            predicted_return = self._run_inference(features)
+
             # Calculate confidence based on data quality
             # More data = higher confidence
             confidence = min(95.0, 50.0 + (len(historical_data) / 10))
-            
-            # Clip predicted return to reasonable range
-            predicted_return = np.clip(predicted_return, -0.1, 0.1)  # ±10%
-            
-            return float(predicted_return * 100), float(confidence)  # Convert to percentage
+
+            return float(predicted_return), float(confidence)
             
         except Exception as e:
             print(f"Prediction error: {e}")
@@ -244,7 +366,9 @@ class KimiK2AIModel:
         """
         if not historical_data:
             # Return default prediction
-            return Prediction(
+            # model_construct skips field validation; all values here are
+            # produced internally, never from user input
+            return Prediction.model_construct(
                 timestamp=datetime.now(),
                 symbol=symbol,
                 predicted_return=0.0,
@@ -255,8 +379,17 @@ class KimiK2AIModel:
                 features_used=["price", "volume"]
             )
         
-        # Predict return
-        predicted_return, confidence = self.predict_next_return(historical_data)
+        # Predict return, reusing the cached inference for repeat polls
+        # within the same bar
+        cache_key = (symbol, historical_data[-1].timestamp, round(current_price, 4))
+        cached = self._prediction_cache.get(cache_key)
+        if cached is not None and datetime.now() - cached[2] < self._prediction_cache_ttl:
+            predicted_return, confidence = cached[0], cached[1]
+        else:
+            predicted_return, confidence = self.predict_next_return(historical_data)
+            if len(self._prediction_cache) >= self._prediction_cache_max:
+                self._prediction_cache.pop(next(iter(self._prediction_cache)))
+            self._prediction_cache[cache_key] = (predicted_return, confidence, datetime.now())
         
         # Calculate predicted price
         predicted_price = current_price * (1 + predicted_return / 100)
@@ -272,7 +405,7 @@ class KimiK2AIModel:
         # Features used
         features_used = ["price", "volume", "spread", "returns", "momentum"]
         
-        return Prediction(
+        return Prediction.model_construct(
             timestamp=datetime.now(),
             symbol=symbol,
             predicted_return=round(predicted_return, 2),
@@ -283,6 +416,174 @@ class KimiK2AIModel:
             features_used=features_used
         )
 
+    def predict_arrays(
+        self,
+        symbol: str,
+        arrays: dict,
+        current_price: float
+    ) -> Prediction:
+        """
+        Generate a prediction from raw OHLCV column arrays
+
+        Entry point for callers that already hold contiguous column
+        arrays (e.g. the SoA extracted for indicators); the inference
+        path goes straight to the feature matrix without touching
+        PriceCandle objects.
+
+        Args:
+            symbol: Trading symbol
+            arrays: Column arrays as produced by candles_to_soa
+                ('close', 'high', 'low', 'volume', 'timestamp')
+            current_price: Current price
+
+        Returns:
+            Prediction object
+        """
+        if not self.is_loaded:
+            self.load_model()
+
+        close = arrays['close']
+        n = close.size
+
+        if n == 0:
+            return Prediction.model_construct(
+                timestamp=datetime.now(),
+                symbol=symbol,
+                predicted_return=0.0,
+                predicted_price=current_price,
+                predicted_trend="neutral",
+                confidence=0.0,
+                model_version="kimi-k2ai-v1",
+                features_used=["price", "volume"]
+            )
+
+        # Reuse the cached inference for repeat polls within the same bar
+        cache_key = (symbol, int(arrays['timestamp'][-1]), round(current_price, 4))
+        cached = self._prediction_cache.get(cache_key)
+        if cached is not None and datetime.now() - cached[2] < self._prediction_cache_ttl:
+            predicted_return, confidence = cached[0], cached[1]
+        elif n < 10:
+            # Not enough data, default prediction
+            predicted_return, confidence = 0.0, 50.0
+        else:
+            try:
+                features = self._features_from_soa(
+                    close, arrays['high'], arrays['low'], arrays['volume']
+                )
+                predicted_return = self._run_inference(features)
+                confidence = min(95.0, 50.0 + (n / 10))
+            except Exception as e:
+                print(f"Prediction error: {e}")
+                # Fallback: simple trend following (dampened)
+                recent_return = float((close[-1] - close[-2]) / close[-2]) * 100
+                predicted_return, confidence = recent_return * 0.5, 60.0
+
+            if len(self._prediction_cache) >= self._prediction_cache_max:
+                self._prediction_cache.pop(next(iter(self._prediction_cache)))
+            self._prediction_cache[cache_key] = (predicted_return, confidence, datetime.now())
+
+        predicted_price = current_price * (1 + predicted_return / 100)
+
+        if predicted_return > 1.0:
+            trend = "bullish"
+        elif predicted_return < -1.0:
+            trend = "bearish"
+        else:
+            trend = "neutral"
+
+        return Prediction.model_construct(
+            timestamp=datetime.now(),
+            symbol=symbol,
+            predicted_return=round(predicted_return, 2),
+            predicted_price=round(predicted_price, 2),
+            predicted_trend=trend,
+            confidence=round(confidence, 2),
+            model_version="kimi-k2ai-v1",
+            features_used=["price", "volume", "spread", "returns", "momentum"]
+        )
+
+    def predict_batch(
+        self,
+        symbols: List[str],
+        histories: List[List[PriceCandle]],
+        current_prices: List[float]
+    ) -> List[Prediction]:
+        """
+        Generate predictions for several symbols in one LSTM forward
+
+        Stacks all feature windows into a (B, sequence_length, 5) tensor
+        so kernel launch overhead is amortized across the batch instead
+        of paid once per symbol.
+
+        Args:
+            symbols: Trading symbols
+            histories: Historical candles per symbol
+            current_prices: Current price per symbol
+
+        Returns:
+            List of Prediction objects, one per symbol
+        """
+        if not self.is_loaded:
+            self.load_model()
+
+        # Fall back to per-symbol predict for symbols without enough data
+        batch = np.zeros((len(symbols), self.sequence_length, 5), dtype=np.float32)
+        batch_idx = []
+        predictions: List[Optional[Prediction]] = [None] * len(symbols)
+
+        for i, (symbol, history, price) in enumerate(zip(symbols, histories, current_prices)):
+            if len(history) < 10:
+                predictions[i] = self.predict(symbol, history, price)
+                continue
+
+            features = self.prepare_features(history)
+            if len(features) < self.sequence_length:
+                padding = np.tile(features[-1:], (self.sequence_length - len(features), 1))
+                features = np.vstack([padding, features])
+            else:
+                features = features[-self.sequence_length:]
+
+            batch[len(batch_idx)] = features
+            batch_idx.append(i)
+
+        if batch_idx:
+            batch_tensor = torch.from_numpy(batch[:len(batch_idx)]).to(
+                self.device, dtype=self._input_buffer.dtype, non_blocking=True
+            )
+
+            # Clamp and scale on-device, then copy the whole batch back
+            # in one transfer
+            with torch.inference_mode():
+                out = self.inference_model(batch_tensor)
+                out = torch.clamp(out, -0.1, 0.1) * 100.0
+            returns = out.float().cpu().numpy().reshape(-1)
+
+            timestamp = datetime.now()
+            for j, i in enumerate(batch_idx):
+                predicted_return = float(returns[j])
+                confidence = min(95.0, 50.0 + (len(histories[i]) / 10))
+                predicted_price = current_prices[i] * (1 + predicted_return / 100)
+
+                if predicted_return > 1.0:
+                    trend = "bullish"
+                elif predicted_return < -1.0:
+                    trend = "bearish"
+                else:
+                    trend = "neutral"
+
+                predictions[i] = Prediction.model_construct(
+                    timestamp=timestamp,
+                    symbol=symbols[i],
+                    predicted_return=round(predicted_return, 2),
+                    predicted_price=round(predicted_price, 2),
+                    predicted_trend=trend,
+                    confidence=round(confidence, 2),
+                    model_version="kimi-k2ai-v1",
+                    features_used=["price", "volume", "spread", "returns", "momentum"]
+                )
+
+        return predictions
+
 
 # Global model instance
 ai_model = KimiK2AIModel()
@@ -6,29 +6,153 @@ Simulates trading strategies on historical data
 from datetime import datetime, timedelta
 from typing import List, Optional
 import numpy as np
+from numba import njit
 from schema import PriceCandle, Trade, BacktestConfig, BacktestResult
 from indicators import calculate_indicators, calculate_rsi, calculate_macd, calculate_sma
-from risk import calculate_risk_metrics
+from risk import calculate_risk_metrics, summarize_trades, TradeBatch
+from soa import candles_to_soa
+
+
+@njit(cache=True)
+def _execute_signals(
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    sig_code: np.ndarray,
+    initial_capital: float,
+    commission_rate: float
+):
+    """
+    Numba state machine for the candle-by-candle execution loop
+
+    Walks (price, timestamp, signal) arrays keeping capital and the open
+    position as scalars, and emits structure-of-arrays trade records plus
+    the equity curve. Trade objects are materialized by the caller only
+    once, after the loop.
+    """
+    n = prices.size
+
+    # Equity gets one slot per candle plus one per close, plus the seed
+    equity = np.empty(2 * n + 2)
+    equity[0] = initial_capital
+    eq_len = 1
+
+    max_trades = n // 2 + 1
+    entry_ts = np.empty(max_trades, np.int64)
+    exit_ts = np.empty(max_trades, np.int64)
+    entry_price_arr = np.empty(max_trades)
+    exit_price_arr = np.empty(max_trades)
+    quantity = np.empty(max_trades)
+    profit_arr = np.empty(max_trades)
+    commission_arr = np.empty(max_trades)
+    n_trades = 0
+
+    capital = initial_capital
+    in_position = False
+    position_size = 0.0
+    entry_price = 0.0
+    entry_time = np.int64(0)
+
+    for i in range(n):
+        price = prices[i]
+
+        if sig_code[i] == 1 and not in_position:
+            # Open long: size from current capital, then deduct commission
+            position_size = capital / price
+            entry_price = price
+            entry_time = timestamps[i]
+            capital -= capital * commission_rate
+            in_position = True
+
+        elif sig_code[i] == -1 and in_position:
+            profit = (price - entry_price) * position_size
+            commission = capital * commission_rate
+            profit -= commission
+            capital += profit
+
+            entry_ts[n_trades] = entry_time
+            exit_ts[n_trades] = timestamps[i]
+            entry_price_arr[n_trades] = entry_price
+            exit_price_arr[n_trades] = price
+            quantity[n_trades] = position_size
+            profit_arr[n_trades] = profit
+            commission_arr[n_trades] = commission
+            n_trades += 1
+
+            equity[eq_len] = capital
+            eq_len += 1
+
+            in_position = False
+            position_size = 0.0
+            entry_price = 0.0
+
+        # Mark-to-market equity including unrealized P&L
+        if in_position:
+            current_value = capital + (price - entry_price) * position_size
+        else:
+            current_value = capital
+
+        if i == eq_len - 1:
+            equity[eq_len - 1] = current_value
+        else:
+            equity[eq_len] = current_value
+            eq_len += 1
+
+    # Close any open position at the last candle
+    if in_position:
+        price = prices[n - 1]
+        profit = (price - entry_price) * position_size
+        commission = capital * commission_rate
+        profit -= commission
+        capital += profit
+
+        entry_ts[n_trades] = entry_time
+        exit_ts[n_trades] = timestamps[n - 1]
+        entry_price_arr[n_trades] = entry_price
+        exit_price_arr[n_trades] = price
+        quantity[n_trades] = position_size
+        profit_arr[n_trades] = profit
+        commission_arr[n_trades] = commission
+        n_trades += 1
+
+        equity[eq_len] = capital
+        eq_len += 1
+
+    return (
+        equity[:eq_len],
+        capital,
+        entry_ts[:n_trades],
+        exit_ts[:n_trades],
+        entry_price_arr[:n_trades],
+        exit_price_arr[:n_trades],
+        quantity[:n_trades],
+        profit_arr[:n_trades],
+        commission_arr[:n_trades]
+    )
 
 
 class Backtester:
     """Backtesting engine for trading strategies"""
     
-    def __init__(self, config: BacktestConfig):
+    def __init__(self, config: BacktestConfig, indicators: Optional[dict] = None):
         """
         Initialize backtester
-        
+
         Args:
             config: Backtest configuration
+            indicators: Precomputed indicator dict (optional); lets
+                parameter sweeps share one calculate_indicators pass
         """
         self.config = config
+        self.indicators = indicators
         self.capital = config.initial_capital
         self.initial_capital = config.initial_capital
         self.position = None  # None, "long", or "short"
+        self._direction = 0  # +1 long, -1 short, 0 flat
         self.position_size = 0.0
         self.entry_price = 0.0
         self.entry_time = None
         self.trades: List[Trade] = []
+        self.trade_batch: Optional[TradeBatch] = None
         self.equity_curve: List[float] = [config.initial_capital]
         self.commission_rate = config.commission
     
@@ -48,6 +172,7 @@ class Backtester:
             return  # Already in a position
         
         self.position = position_type
+        self._direction = 1 if position_type == "long" else -1
         self.position_size = self.calculate_position_size(price)
         self.entry_price = price
         self.entry_time = timestamp
@@ -65,11 +190,8 @@ class Backtester:
         if self.position is None:
             return None
         
-        # Calculate profit
-        if self.position == "long":
-            profit = (price - self.entry_price) * self.position_size
-        else:  # short
-            profit = (self.entry_price - price) * self.position_size
+        # Calculate profit (branchless: direction carries the sign)
+        profit = (price - self.entry_price) * self._direction * self.position_size
         
         # Deduct commission
         commission = self.capital * self.commission_rate
@@ -99,6 +221,7 @@ class Backtester:
         
         # Reset position
         self.position = None
+        self._direction = 0
         self.position_size = 0.0
         self.entry_price = 0.0
         self.entry_time = None
@@ -111,11 +234,8 @@ class Backtester:
             return self.capital
         
         # Calculate unrealized profit
-        if self.position == "long":
-            unrealized = (current_price - self.entry_price) * self.position_size
-        else:  # short
-            unrealized = (self.entry_price - current_price) * self.position_size
-        
+        unrealized = (current_price - self.entry_price) * self._direction * self.position_size
+
         return self.capital + unrealized
     
     def generate_signals(
@@ -137,55 +257,54 @@ class Backtester:
         Returns:
             List of signal dictionaries
         """
-        signals = []
-        prices = [c.close for c in candles]
-        rsi = indicators.get('rsi', [])
+        n = len(candles)
+        prices = candles_to_soa(candles)['close']
+        rsi = np.asarray(indicators.get('rsi', []), dtype=np.float64)
         macd_data = indicators.get('macd', {})
-        macd_line = macd_data.get('macd', [])
-        signal_line = macd_data.get('signal', [])
-        
-        for i in range(len(candles)):
-            signal = {
+        macd_line = np.asarray(macd_data.get('macd', []), dtype=np.float64)
+        signal_line = np.asarray(macd_data.get('signal', []), dtype=np.float64)
+
+        # RSI with NaN warm-up treated as neutral
+        rsi_value = np.full(n, 50.0)
+        if rsi.size:
+            m = min(n, rsi.size)
+            rsi_value[:m] = np.where(np.isnan(rsi[:m]), 50.0, rsi[:m])
+
+        # Crossover masks computed in one shot instead of per-index checks
+        cross_up = np.zeros(n, dtype=bool)
+        cross_down = np.zeros(n, dtype=bool)
+        if macd_line.size == n and signal_line.size == n and n > 1:
+            valid = ~(np.isnan(macd_line) | np.isnan(signal_line))
+            pair_valid = valid[1:] & valid[:-1]
+            cross_up[1:] = pair_valid & \
+                (macd_line[:-1] <= signal_line[:-1]) & (macd_line[1:] > signal_line[1:])
+            cross_down[1:] = pair_valid & \
+                (macd_line[:-1] >= signal_line[:-1]) & (macd_line[1:] < signal_line[1:])
+
+        buy_ok = (rsi_value < 30) & cross_up
+        sell_ok = (rsi_value > 70) | cross_down
+
+        # Only the position state transition stays sequential: a buy is
+        # valid when flat, a sell when holding
+        signals = []
+        in_position = self.position is not None
+
+        for i in range(n):
+            action = 'hold'
+            if i >= 50:  # Need enough data for indicators
+                if not in_position and buy_ok[i]:
+                    action = 'buy'
+                    in_position = True
+                elif in_position and sell_ok[i]:
+                    action = 'sell'
+                    in_position = False
+
+            signals.append({
                 'timestamp': candles[i].timestamp,
-                'action': 'hold',
+                'action': action,
                 'price': prices[i]
-            }
-            
-            if i < 50:  # Need enough data for indicators
-                signals.append(signal)
-                continue
-            
-            # Check RSI
-            rsi_value = rsi[i] if i < len(rsi) and not np.isnan(rsi[i]) else 50.0
-            
-            # Check MACD crossover
-            macd_cross_up = False
-            macd_cross_down = False
-            
-            if (i > 0 and i < len(macd_line) and i < len(signal_line) and
-                not np.isnan(macd_line[i]) and not np.isnan(signal_line[i]) and
-                not np.isnan(macd_line[i-1]) and not np.isnan(signal_line[i-1])):
-                
-                # MACD crosses above signal
-                if macd_line[i-1] <= signal_line[i-1] and macd_line[i] > signal_line[i]:
-                    macd_cross_up = True
-                
-                # MACD crosses below signal
-                if macd_line[i-1] >= signal_line[i-1] and macd_line[i] < signal_line[i]:
-                    macd_cross_down = True
-            
-            # Generate signals
-            if self.position is None:
-                # Look for entry
-                if rsi_value < 30 and macd_cross_up:
-                    signal['action'] = 'buy'
-            else:
-                # Look for exit
-                if rsi_value > 70 or macd_cross_down:
-                    signal['action'] = 'sell'
-            
-            signals.append(signal)
-        
+            })
+
         return signals
     
     def run_backtest(self, candles: List[PriceCandle]) -> BacktestResult:
@@ -201,37 +320,67 @@ class Backtester:
         if not candles:
             return self._empty_result()
         
-        # Calculate indicators
-        indicators = calculate_indicators(candles)
+        # Calculate indicators (reuse a precomputed set when provided)
+        indicators = self.indicators if self.indicators is not None else calculate_indicators(candles)
         
         # Generate signals
         signals = self.generate_signals(candles, indicators)
-        
-        # Execute trades
-        for i, signal in enumerate(signals):
-            candle = candles[i]
-            current_price = candle.close
-            timestamp = candle.timestamp
-            
-            if signal['action'] == 'buy' and self.position is None:
-                self.entry_time = timestamp
-                self.open_position(current_price, "long", timestamp)
-            
-            elif signal['action'] == 'sell' and self.position is not None:
-                self.close_position(current_price, timestamp)
-            
-            # Update equity curve (with unrealized P&L)
-            current_value = self.update_position_value(current_price)
-            if i == len(self.equity_curve) - 1:
-                self.equity_curve[-1] = current_value
-            else:
-                self.equity_curve.append(current_value)
-        
-        # Close any open position at the end
-        if self.position is not None:
-            final_price = candles[-1].close
-            self.close_position(final_price, candles[-1].timestamp)
-        
+
+        # Execute trades in the compiled state machine
+        n = len(candles)
+        soa = candles_to_soa(candles)
+        prices = soa['close']
+        timestamps = soa['timestamp']
+        action_code = {'hold': 0, 'buy': 1, 'sell': -1}
+        sig_code = np.fromiter(
+            (action_code[s['action']] for s in signals), dtype=np.int8, count=n
+        )
+
+        (equity, capital, entry_ts, exit_ts, entry_prices, exit_prices,
+         quantities, profits, commissions) = _execute_signals(
+            prices, timestamps, sig_code,
+            self.initial_capital, self.commission_rate
+        )
+
+        self.capital = float(capital)
+        # Keep the kernel's ndarray; it is rounded and listified once in
+        # _calculate_results instead of per-value
+        self.equity_curve = equity
+        # Round the numeric columns in bulk, then materialize the Trade
+        # objects without re-validating values the kernel just produced
+        profits_r = np.round(profits, 2)
+        profit_pcts_r = np.round(profits / (entry_prices * quantities) * 100, 2)
+        commissions_r = np.round(commissions, 2)
+
+        self.trades = [
+            Trade.model_construct(
+                entry_time=datetime.fromtimestamp(entry_ts[i]),
+                exit_time=datetime.fromtimestamp(exit_ts[i]),
+                entry_price=float(entry_prices[i]),
+                exit_price=float(exit_prices[i]),
+                position="long",
+                quantity=float(quantities[i]),
+                profit=float(profits_r[i]),
+                profit_pct=float(profit_pcts_r[i]),
+                commission=float(commissions_r[i])
+            )
+            for i in range(len(entry_ts))
+        ]
+
+        # SoA companion of the trade list, built straight from the
+        # kernel's column arrays; aggregates read these instead of
+        # chasing one Trade object per row
+        self.trade_batch = TradeBatch(
+            entry_times_ns=entry_ts * 1_000_000_000,
+            exit_times_ns=exit_ts * 1_000_000_000,
+            entry_prices=entry_prices,
+            exit_prices=exit_prices,
+            quantities=quantities,
+            profits=profits_r,
+            profit_pcts=profit_pcts_r,
+            commissions=commissions_r
+        )
+
         # Calculate metrics
         return self._calculate_results()
     
@@ -243,28 +392,46 @@ class Backtester:
         # Calculate returns
         total_return = ((self.capital - self.initial_capital) / self.initial_capital) * 100
         
-        # Win rate
-        winning_trades = [t for t in self.trades if t.profit > 0]
-        win_rate = (len(winning_trades) / len(self.trades)) * 100 if self.trades else 0.0
-        
-        # Profit factor
-        total_profit = sum(t.profit for t in self.trades if t.profit > 0)
-        total_loss = abs(sum(t.profit for t in self.trades if t.profit < 0))
-        profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
-        
-        # Average trade duration
-        durations = [
-            (t.exit_time - t.entry_time).total_seconds() / 3600
-            for t in self.trades
-        ]
-        avg_duration = np.mean(durations) if durations else 0.0
-        
-        # Risk metrics
-        risk_metrics = calculate_risk_metrics(self.equity_curve, self.trades)
-        
-        return BacktestResult(
+        # Trade aggregates from the SoA batch when the kernel produced
+        # one; the incremental legacy path still loops over Trade objects
+        if self.trade_batch is not None:
+            summary = summarize_trades(self.trade_batch)
+            win_rate = summary["win_rate"]
+            profit_factor = summary["profit_factor"]
+            avg_duration = summary["avg_trade_duration"]
+        else:
+            # Win rate
+            winning_trades = [t for t in self.trades if t.profit > 0]
+            win_rate = (len(winning_trades) / len(self.trades)) * 100 if self.trades else 0.0
+
+            # Profit factor
+            total_profit = sum(t.profit for t in self.trades if t.profit > 0)
+            total_loss = abs(sum(t.profit for t in self.trades if t.profit < 0))
+            profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
+
+            # Average trade duration
+            durations = [
+                (t.exit_time - t.entry_time).total_seconds() / 3600
+                for t in self.trades
+            ]
+            avg_duration = np.mean(durations) if durations else 0.0
+
+        # Risk metrics (the SoA batch when the kernel produced one, the
+        # Trade list on the incremental legacy path)
+        risk_metrics = calculate_risk_metrics(
+            self.equity_curve,
+            self.trade_batch if self.trade_batch is not None else self.trades
+        )
+
+        if isinstance(self.equity_curve, np.ndarray):
+            equity_curve = np.round(self.equity_curve, 2).tolist()
+        else:
+            equity_curve = [round(v, 2) for v in self.equity_curve]
+
+        # model_construct: every field was computed in this method
+        return BacktestResult.model_construct(
             config=self.config,
-            equity_curve=[round(v, 2) for v in self.equity_curve],
+            equity_curve=equity_curve,
             trades=self.trades,
             sharpe_ratio=risk_metrics.sharpe_ratio,
             max_drawdown=risk_metrics.max_drawdown,
@@ -278,7 +445,7 @@ class Backtester:
     
     def _empty_result(self) -> BacktestResult:
         """Return empty result when no trades"""
-        return BacktestResult(
+        return BacktestResult.model_construct(
             config=self.config,
             equity_curve=[self.initial_capital],
             trades=[],
@@ -292,3 +459,33 @@ class Backtester:
             final_capital=self.initial_capital
         )
 
+
+def run_backtest_for_config(config: BacktestConfig) -> BacktestResult:
+    """
+    Fetch data and run a single backtest for a configuration
+
+    Module-level (and therefore picklable) so the batch endpoint can
+    dispatch it to worker processes.
+
+    Args:
+        config: Backtest configuration
+
+    Returns:
+        BacktestResult object
+
+    Raises:
+        ValueError: If no data is available for the backtest period
+    """
+    from price_data import price_manager
+
+    candles = price_manager.get_historical_data(
+        symbol=config.symbol,
+        start_date=config.start_date,
+        end_date=config.end_date,
+        use_real_data=True
+    )
+
+    if not candles:
+        raise ValueError(f"No data available for {config.symbol}")
+
+    return Backtester(config).run_backtest(candles)
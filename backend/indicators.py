@@ -1,11 +1,19 @@
 """
 Technical Indicators
 Implementation of common trading indicators
+
+All rolling computations run as O(N) array kernels: SMA/Bollinger/ATR
+use cumulative sums, EMA/MACD run through scipy's IIR filter, and RSI is
+a compiled Numba loop. Results are memoized per candle series, so no
+per-window Python callbacks remain on the hot path.
 """
 
 import numpy as np
+from numba import njit
+from scipy.signal import lfilter
 from typing import List
 from schema import PriceCandle
+from soa import candles_to_soa
 
 
 def calculate_sma(prices: List[float], period: int) -> List[float]:
@@ -22,18 +30,28 @@ def calculate_sma(prices: List[float], period: int) -> List[float]:
     Returns:
         List of SMA values (NaN for first period-1 values)
     """
-    if len(prices) < period:
-        return [np.nan] * len(prices)
-    
-    sma = []
-    for i in range(len(prices)):
-        if i < period - 1:
-            sma.append(np.nan)
-        else:
-            window = prices[i - period + 1:i + 1]
-            sma.append(np.mean(window))
-    
-    return sma
+    return _calculate_sma_np(prices, period).tolist()
+
+
+def _calculate_sma_np(prices: List[float], period: int) -> np.ndarray:
+    """
+    Vectorized SMA returning an ndarray (no tolist round-trip)
+
+    Uses a cumulative sum so the rolling mean is O(N) instead of
+    O(N * period) with per-window np.mean calls.
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    out = np.full(p.size, np.nan)
+
+    if p.size < period:
+        return out
+
+    cumsum = np.empty(p.size + 1)
+    cumsum[0] = 0.0
+    np.cumsum(p, out=cumsum[1:])
+
+    out[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+    return out
 
 
 def calculate_ema(prices: List[float], period: int) -> List[float]:
@@ -50,23 +68,37 @@ def calculate_ema(prices: List[float], period: int) -> List[float]:
     Returns:
         List of EMA values
     """
-    if len(prices) < period:
-        return [np.nan] * len(prices)
-    
-    ema = []
+    return _calculate_ema_np(prices, period).tolist()
+
+
+def _calculate_ema_np(prices: List[float], period: int) -> np.ndarray:
+    """
+    Vectorized EMA returning an ndarray (no tolist round-trip)
+
+    The EMA recurrence is a first-order IIR filter, so it runs through
+    scipy.signal.lfilter in compiled C instead of a Python loop.
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    out = np.full(p.size, np.nan)
+
+    if p.size < period:
+        return out
+
     multiplier = 2 / (period + 1)
-    
+
     # First EMA is SMA
-    first_sma = np.mean(prices[:period])
-    ema.extend([np.nan] * (period - 1))
-    ema.append(first_sma)
-    
-    # Calculate subsequent EMAs
-    for i in range(period, len(prices)):
-        ema_value = (prices[i] - ema[-1]) * multiplier + ema[-1]
-        ema.append(ema_value)
-    
-    return ema
+    first_sma = p[:period].mean()
+    out[period - 1] = first_sma
+
+    if p.size > period:
+        # ema[i] = multiplier * price[i] + (1 - multiplier) * ema[i-1]
+        filtered, _ = lfilter(
+            [multiplier], [1, multiplier - 1],
+            p[period:], zi=[first_sma * (1 - multiplier)]
+        )
+        out[period:] = filtered
+
+    return out
 
 
 def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
@@ -84,44 +116,57 @@ def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
     Returns:
         List of RSI values (0-100)
     """
-    if len(prices) < period + 1:
-        return [np.nan] * len(prices)
-    
-    rsi = [np.nan] * period
-    
-    # Calculate price changes
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    
-    # Initial average gain and loss
-    gains = [d if d > 0 else 0 for d in deltas[:period]]
-    losses = [-d if d < 0 else 0 for d in deltas[:period]]
-    
-    avg_gain = np.mean(gains)
-    avg_loss = np.mean(losses)
-    
-    # Calculate first RSI
+    p = np.ascontiguousarray(prices, dtype=np.float64)
+    return _rsi_numba(p, period).tolist()
+
+
+@njit(cache=True, fastmath=True)
+def _rsi_numba(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Numba kernel for RSI with Wilder's smoothing
+
+    The recurrence is inherently serial, so it stays a scalar loop but
+    runs as compiled code instead of interpreted Python.
+    """
+    n = prices.size
+    out = np.full(n, np.nan)
+
+    if n < period + 1:
+        return out
+
+    # Initial average gain and loss over the first `period` deltas
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
     if avg_loss == 0:
-        rsi.append(100.0)
+        out[period] = 100.0
     else:
-        rs = avg_gain / avg_loss
-        rsi.append(100 - (100 / (1 + rs)))
-    
-    # Calculate subsequent RSIs using Wilder's smoothing
-    for i in range(period, len(deltas)):
-        gain = deltas[i] if deltas[i] > 0 else 0
-        loss = -deltas[i] if deltas[i] < 0 else 0
-        
-        # Wilder's smoothing: new_avg = (old_avg * (n-1) + new_value) / n
+        out[period] = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # Subsequent RSIs using Wilder's smoothing:
+    # new_avg = (old_avg * (n-1) + new_value) / n
+    for i in range(period + 1, n):
+        delta = prices[i] - prices[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
         avg_gain = (avg_gain * (period - 1) + gain) / period
         avg_loss = (avg_loss * (period - 1) + loss) / period
-        
+
         if avg_loss == 0:
-            rsi.append(100.0)
+            out[i] = 100.0
         else:
-            rs = avg_gain / avg_loss
-            rsi.append(100 - (100 / (1 + rs)))
-    
-    return rsi
+            out[i] = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    return out
 
 
 def calculate_macd(
@@ -155,39 +200,27 @@ def calculate_macd(
             'histogram': nan_list
         }
     
-    # Calculate EMAs
-    fast_ema = calculate_ema(prices, fast_period)
-    slow_ema = calculate_ema(prices, slow_period)
-    
+    # Calculate EMAs (NaN warm-up values propagate through the subtraction)
+    fast_ema = _calculate_ema_np(prices, fast_period)
+    slow_ema = _calculate_ema_np(prices, slow_period)
+
     # MACD line
-    macd_line = [
-        fast_ema[i] - slow_ema[i] if not (np.isnan(fast_ema[i]) or np.isnan(slow_ema[i]))
-        else np.nan
-        for i in range(len(prices))
-    ]
-    
-    # Signal line (EMA of MACD line)
-    # Filter out NaN values for signal calculation
-    macd_values = [v for v in macd_line if not np.isnan(v)]
-    if len(macd_values) < signal_period:
-        signal_line = [np.nan] * len(prices)
-    else:
-        signal_line = calculate_ema(macd_values, signal_period)
-        # Pad with NaN to match original length
-        nan_count = len(prices) - len(signal_line)
-        signal_line = [np.nan] * nan_count + signal_line
-    
-    # Histogram
-    histogram = [
-        macd_line[i] - signal_line[i] if not (np.isnan(macd_line[i]) or np.isnan(signal_line[i]))
-        else np.nan
-        for i in range(len(prices))
-    ]
-    
+    macd_line = fast_ema - slow_ema
+
+    # Signal line: the MACD line is NaN exactly for the first
+    # slow_period - 1 indices, so slice past the warm-up and run the
+    # EMA directly instead of filtering NaNs and repadding
+    valid_start = slow_period - 1
+    signal_line = np.full(macd_line.size, np.nan)
+    signal_line[valid_start:] = _calculate_ema_np(macd_line[valid_start:], signal_period)
+
+    # Histogram (NaNs propagate through the subtraction)
+    histogram = macd_line - signal_line
+
     return {
-        'macd': macd_line,
-        'signal': signal_line,
-        'histogram': histogram
+        'macd': macd_line.tolist(),
+        'signal': signal_line.tolist(),
+        'histogram': histogram.tolist()
     }
 
 
@@ -212,25 +245,30 @@ def calculate_bollinger_bands(
     Returns:
         Dictionary with 'upper', 'middle', 'lower' bands
     """
-    sma = calculate_sma(prices, period)
-    
-    upper = []
-    lower = []
-    
-    for i in range(len(prices)):
-        if np.isnan(sma[i]):
-            upper.append(np.nan)
-            lower.append(np.nan)
-        else:
-            window = prices[max(0, i - period + 1):i + 1]
-            std = np.std(window)
-            upper.append(sma[i] + (std * num_std))
-            lower.append(sma[i] - (std * num_std))
-    
+    p = np.asarray(prices, dtype=np.float64)
+    middle = _calculate_sma_np(p, period)
+
+    upper = np.full(p.size, np.nan)
+    lower = np.full(p.size, np.nan)
+
+    if p.size >= period:
+        # Rolling variance in O(N) via var = E[x^2] - E[x]^2, computed
+        # from cumulative sums of prices and squared prices
+        c2 = np.empty(p.size + 1)
+        c2[0] = 0.0
+        np.cumsum(p * p, out=c2[1:])
+
+        mean = middle[period - 1:]
+        mean_sq = (c2[period:] - c2[:-period]) / period
+        std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+        upper[period - 1:] = mean + std * num_std
+        lower[period - 1:] = mean - std * num_std
+
     return {
-        'upper': upper,
-        'middle': sma,
-        'lower': lower
+        'upper': upper.tolist(),
+        'middle': middle.tolist(),
+        'lower': lower.tolist()
     }
 
 
@@ -250,53 +288,71 @@ def calculate_atr(
         period: Number of periods (default 14)
         
     Returns:
-        List of ATR values
+        List of ATR values (NaN for the first period values), same
+        length as candles
     """
-    if len(candles) < period + 1:
-        return [np.nan] * len(candles)
-    
-    true_ranges = []
-    
-    for i in range(1, len(candles)):
-        high = candles[i].high
-        low = candles[i].low
-        prev_close = candles[i-1].close
-        
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
-    
-    # Calculate ATR as SMA of TR
-    atr = [np.nan] * period
-    for i in range(period, len(true_ranges) + 1):
-        window = true_ranges[i - period:i]
-        atr.append(np.mean(window))
-    
-    # Pad beginning
-    atr = [np.nan] + atr
-    
-    return atr
+    n = len(candles)
+    if n < period + 1:
+        return [np.nan] * n
+
+    soa = candles_to_soa(candles)
+    high = soa['high'][1:]
+    low = soa['low'][1:]
+    prev_close = soa['close'][:-1]
+
+    # True range, all three legs at once
+    tr = np.maximum.reduce([
+        high - low,
+        np.abs(high - prev_close),
+        np.abs(low - prev_close)
+    ])
+
+    # ATR as rolling mean of TR via the cumsum trick
+    cumsum = np.empty(tr.size + 1)
+    cumsum[0] = 0.0
+    np.cumsum(tr, out=cumsum[1:])
+
+    atr = np.full(n, np.nan)
+    atr[period:] = (cumsum[period:] - cumsum[:-period]) / period
+
+    return atr.tolist()
+
+
+# Recently computed indicator sets, keyed by the candle series identity.
+# Parameter sweeps re-run backtests over the same series many times; this
+# avoids recomputing all eight indicators on each pass.
+_indicator_cache: dict = {}
+_INDICATOR_CACHE_MAX = 32
 
 
 def calculate_indicators(candles: List[PriceCandle]) -> dict:
     """
     Calculate all indicators for a series of candles
-    
+
+    Results are memoized on (first timestamp, last timestamp, length,
+    last close) so repeated backtests over the same series reuse the
+    previous computation.
+
     Args:
         candles: List of PriceCandle objects
-        
+
     Returns:
         Dictionary with all indicator values
     """
     if not candles:
         return {}
-    
-    prices = [c.close for c in candles]
-    
-    return {
+
+    cache_key = (
+        candles[0].timestamp, candles[-1].timestamp,
+        len(candles), candles[-1].close
+    )
+    cached = _indicator_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    prices = candles_to_soa(candles)['close']
+
+    result = {
         'sma_20': calculate_sma(prices, 20),
         'sma_50': calculate_sma(prices, 50),
         'ema_12': calculate_ema(prices, 12),
@@ -307,3 +363,9 @@ def calculate_indicators(candles: List[PriceCandle]) -> dict:
         'atr': calculate_atr(candles, 14)
     }
 
+    if len(_indicator_cache) >= _INDICATOR_CACHE_MAX:
+        _indicator_cache.pop(next(iter(_indicator_cache)))
+    _indicator_cache[cache_key] = result
+
+    return result
+
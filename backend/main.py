@@ -3,28 +3,39 @@ FastAPI Main Application
 AI Trading Application Backend
 """
 
+import asyncio
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
+import os
+import sys
 import uvicorn
 
 from schema import (
     PriceCandle,
     MarketDataRequest,
+    BatchMarketDataRequest,
     Trade,
     BacktestConfig,
     BacktestResult,
     Prediction,
     PredictionRequest,
+    BatchPredictionRequest,
     RiskMetrics,
     AppSettings,
     HealthCheck,
     ErrorResponse
 )
 from price_data import price_manager
+from real_data import real_data_fetcher
 from indicators import calculate_indicators
-from backtester import Backtester
+from backtester import Backtester, run_backtest_for_config
+from soa import candles_to_soa
 from risk import calculate_risk_metrics
 from ai_model import ai_model
 
@@ -32,7 +43,10 @@ from ai_model import ai_model
 app = FastAPI(
     title="AI Trading Application",
     description="Full-stack AI trading simulator with backtesting and predictions",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes the large candle/indicator payloads several times
+    # faster than the stdlib encoder (and handles numpy scalars natively)
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -73,6 +87,23 @@ async def health_check():
 # Market Data Endpoints
 # ============================================================================
 
+# Above this many candles the response is streamed in chunks instead of
+# buffered as one JSON body (a year of 1-minute bars is ~525k candles)
+_STREAM_THRESHOLD = 10_000
+_STREAM_CHUNK = 4096
+
+
+def _stream_candles(data: List[PriceCandle]):
+    """Yield a JSON array of candles in orjson-encoded chunks"""
+    yield b"["
+    for start in range(0, len(data), _STREAM_CHUNK):
+        chunk = orjson.dumps([vars(c) for c in data[start:start + _STREAM_CHUNK]])
+        if start:
+            yield b","
+        yield chunk[1:-1]  # splice the chunk into the enclosing array
+    yield b"]"
+
+
 @app.get("/api/market-data/{symbol}", response_model=List[PriceCandle], tags=["Market Data"])
 async def get_market_data(
     symbol: str,
@@ -92,13 +123,21 @@ async def get_market_data(
         use_real_data: Use real data from Yahoo Finance (default: True)
     """
     try:
-        data = price_manager.get_historical_data(
+        # Offload to a worker thread: the underlying fetch blocks on
+        # network I/O and would otherwise stall the event loop
+        data = await asyncio.to_thread(
+            price_manager.get_historical_data,
             symbol=symbol,
             start_date=start_date,
             end_date=end_date,
             interval=interval,
             use_real_data=use_real_data
         )
+
+        # Stream oversized ranges so TTFB and memory stay flat
+        if len(data) > _STREAM_THRESHOLD:
+            return StreamingResponse(_stream_candles(data), media_type="application/json")
+
         return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -108,7 +147,8 @@ async def get_market_data(
 async def get_market_data_post(request: MarketDataRequest):
     """Get market data via POST request"""
     try:
-        data = price_manager.get_historical_data(
+        data = await asyncio.to_thread(
+            price_manager.get_historical_data,
             symbol=request.symbol,
             start_date=request.start_date,
             end_date=request.end_date,
@@ -120,21 +160,43 @@ async def get_market_data_post(request: MarketDataRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/market-data/batch", response_model=Dict[str, List[PriceCandle]], tags=["Market Data"])
+async def get_market_data_batch(request: BatchMarketDataRequest):
+    """
+    Get market data for multiple symbols in one upstream call
+
+    Args:
+        request: Batch request with symbol list and date range
+
+    Returns:
+        Dictionary of symbol -> list of candles
+    """
+    try:
+        return await real_data_fetcher.get_batch_historical_data_async(
+            symbols=request.symbols,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            interval=request.interval
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/market-data/{symbol}/latest", response_model=PriceCandle, tags=["Market Data"])
 async def get_latest_price(symbol: str):
     """Get latest price for symbol (uses real data when available)"""
     try:
         # Try real data first
         try:
-            from real_data import real_data_fetcher
-            latest = real_data_fetcher.get_latest_price(symbol)
+            latest = await real_data_fetcher.get_latest_price_async(symbol)
             if latest:
                 return latest
         except Exception as e:
             print(f"Real data fetch failed, using fallback: {e}")
-        
+
         # Fallback to historical data
-        data = price_manager.get_historical_data(
+        data = await asyncio.to_thread(
+            price_manager.get_historical_data,
             symbol=symbol,
             start_date=datetime.now() - timedelta(days=1),
             end_date=datetime.now(),
@@ -152,7 +214,6 @@ async def get_latest_price(symbol: str):
 async def search_symbols(query: str):
     """Search for stock symbols"""
     try:
-        from real_data import real_data_fetcher
         results = real_data_fetcher.search_symbol(query)
         return {"results": results}
     except Exception as e:
@@ -187,23 +248,33 @@ async def get_indicators(
             raise HTTPException(status_code=404, detail="No data available")
         
         indicators = calculate_indicators(candles)
-        
-        # Convert NaN to None for JSON serialization
-        def clean_nan(obj):
-            if isinstance(obj, dict):
-                return {k: clean_nan(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_nan(item) for item in obj]
-            elif isinstance(obj, float) and (obj != obj):  # NaN check
-                return None
-            return obj
-        
-        return clean_nan(indicators)
-        
+
+        return _clean_nan_indicators(indicators)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _nan_to_none(values: list) -> list:
+    """Replace NaN floats with None in a flat list"""
+    return [None if v != v else v for v in values]
+
+
+def _clean_nan_indicators(indicators: dict) -> dict:
+    """
+    Convert NaN to None for JSON serialization
+
+    The indicator dict is known to be exactly one level of lists or
+    dicts-of-lists, so a flat sweep avoids the recursive per-element
+    function calls of a generic tree walk.
+    """
+    return {
+        key: {k: _nan_to_none(v) for k, v in value.items()}
+        if isinstance(value, dict) else _nan_to_none(value)
+        for key, value in indicators.items()
+    }
+
+
 # ============================================================================
 # Backtesting Endpoints
 # ============================================================================
@@ -275,9 +346,36 @@ async def quick_backtest(
         
         backtester = Backtester(config)
         result = backtester.run_backtest(candles)
-        
+
         return result
-        
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/backtest/batch", response_model=Dict[str, BacktestResult], tags=["Backtesting"])
+async def run_backtest_batch(configs: List[BacktestConfig]):
+    """
+    Run several backtests in parallel worker processes
+
+    Backtests are CPU-bound, so each config is dispatched to the process
+    pool and the batch completes in roughly the time of the slowest
+    single backtest instead of their sum.
+
+    Args:
+        configs: One backtest configuration per symbol
+
+    Returns:
+        Dictionary mapping symbol to its BacktestResult
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(app.state.backtest_pool, run_backtest_for_config, config)
+            for config in configs
+        ])
+        return {config.symbol: result for config, result in zip(configs, results)}
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -286,6 +384,93 @@ async def quick_backtest(
 # AI Prediction Endpoints
 # ============================================================================
 
+# Seconds per interval, used to size prediction data fetches
+_INTERVAL_SECONDS = {"1m": 60, "5m": 300, "1h": 3600, "1d": 86400}
+
+
+def _approx_start(end_date: datetime, interval: str, lookback_periods: int,
+                  safety: float = 1.5) -> datetime:
+    """
+    Earliest date that still covers lookback_periods bars
+
+    The safety factor absorbs weekends, holidays, and gaps so the slice
+    doesn't come up short, while avoiding the old fixed 365-day fetch.
+    """
+    seconds = _INTERVAL_SECONDS.get(interval, 86400)
+    return end_date - timedelta(seconds=seconds * lookback_periods * safety)
+
+class PredictionBatcher:
+    """
+    Coalesce concurrent prediction requests into micro-batches
+
+    Requests that land within the batching window are stacked into one
+    predict_batch forward (a single [B, N, 5] matmul) instead of running
+    B separate [1, N, 5] forwards. A lone request in the window falls
+    through to the cached single-prediction path.
+    """
+
+    def __init__(self, window: float = 0.01, max_batch: int = 64):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = []  # (symbol, history, current_price, future)
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        symbol: str,
+        history: List[PriceCandle],
+        current_price: float
+    ) -> Prediction:
+        """Queue one request and wait for its batched prediction"""
+        loop = asyncio.get_running_loop()
+
+        # Start (or restart) the drain task lazily on the running loop
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._drain())
+
+        future = loop.create_future()
+        self._queue.append((symbol, history, current_price, future))
+        self._wake.set()
+        return await future
+
+    async def _drain(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            # Let requests arriving close together join the same batch
+            await asyncio.sleep(self.window)
+
+            while self._queue:
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+
+                try:
+                    if len(batch) == 1:
+                        symbol, history, price, _ = batch[0]
+                        predictions = [ai_model.predict_arrays(
+                            symbol, candles_to_soa(history), price
+                        )]
+                    else:
+                        predictions = ai_model.predict_batch(
+                            [b[0] for b in batch],
+                            [b[1] for b in batch],
+                            [b[2] for b in batch]
+                        )
+                    for (_, _, _, future), prediction in zip(batch, predictions):
+                        if not future.done():
+                            future.set_result(prediction)
+                except Exception as e:
+                    for _, _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+
+
+prediction_batcher = PredictionBatcher()
+
+
 @app.post("/api/predict", response_model=Prediction, tags=["AI Predictions"])
 async def predict_price(request: PredictionRequest):
     """
@@ -300,10 +485,11 @@ async def predict_price(request: PredictionRequest):
     try:
         # Get historical data if not provided
         if not request.historical_data:
+            end_date = datetime.now()
             historical_data = price_manager.get_historical_data(
                 symbol=request.symbol,
-                start_date=datetime.now() - timedelta(days=365),
-                end_date=datetime.now(),
+                start_date=_approx_start(end_date, "1d", request.lookback_periods),
+                end_date=end_date,
                 use_real_data=True
             )
             # Take last N periods
@@ -315,16 +501,51 @@ async def predict_price(request: PredictionRequest):
             raise HTTPException(status_code=404, detail="No historical data available")
         
         current_price = historical_data[-1].close
-        
-        # Generate prediction
-        prediction = ai_model.predict(
-            symbol=request.symbol,
-            historical_data=historical_data,
-            current_price=current_price
+
+        # Generate prediction; concurrent requests share one forward
+        prediction = await prediction_batcher.submit(
+            request.symbol, historical_data, current_price
         )
-        
+
         return prediction
-        
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/predict/batch", response_model=List[Prediction], tags=["AI Predictions"])
+async def predict_price_batch(request: BatchPredictionRequest):
+    """
+    Get AI predictions for multiple symbols in a single model forward
+
+    Args:
+        request: Batch prediction request with symbols
+
+    Returns:
+        List of Prediction objects, one per symbol
+    """
+    try:
+        histories = []
+        current_prices = []
+
+        end_date = datetime.now()
+        for symbol in request.symbols:
+            historical_data = price_manager.get_historical_data(
+                symbol=symbol,
+                start_date=_approx_start(end_date, "1d", request.lookback_periods),
+                end_date=end_date,
+                use_real_data=True
+            )
+            historical_data = historical_data[-request.lookback_periods:]
+
+            if not historical_data:
+                raise HTTPException(status_code=404, detail=f"No data available for {symbol}")
+
+            histories.append(historical_data)
+            current_prices.append(historical_data[-1].close)
+
+        return ai_model.predict_batch(request.symbols, histories, current_prices)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -336,10 +557,11 @@ async def predict_price_get(
 ):
     """Get prediction via GET request"""
     try:
+        end_date = datetime.now()
         historical_data = price_manager.get_historical_data(
             symbol=symbol,
-            start_date=datetime.now() - timedelta(days=365),
-            end_date=datetime.now(),
+            start_date=_approx_start(end_date, "1d", lookback_periods),
+            end_date=end_date,
             use_real_data=True
         )
         
@@ -348,13 +570,11 @@ async def predict_price_get(
         
         historical_data = historical_data[-lookback_periods:]
         current_price = historical_data[-1].close
-        
-        prediction = ai_model.predict(
-            symbol=symbol,
-            historical_data=historical_data,
-            current_price=current_price
+
+        prediction = await prediction_batcher.submit(
+            symbol, historical_data, current_price
         )
-        
+
         return prediction
         
     except Exception as e:
@@ -382,7 +602,7 @@ async def calculate_risk(equity_curve: List[float], trades: List[Trade]):
             raise HTTPException(status_code=400, detail="Equity curve cannot be empty")
         
         metrics = calculate_risk_metrics(equity_curve, trades)
-        return metrics
+        return metrics.to_pydantic()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -433,15 +653,34 @@ async def startup_event():
     print("AI model loaded successfully!")
     print("✅ Real stock data integration enabled (Yahoo Finance)")
 
+    # Worker processes for CPU-bound batch backtests
+    app.state.backtest_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Clean up on shutdown"""
+    pool = getattr(app.state, "backtest_pool", None)
+    if pool is not None:
+        pool.shutdown()
+
 
 # ============================================================================
 # Run Server
 # ============================================================================
 
 if __name__ == "__main__":
+    # Production defaults: one worker per core on uvloop/httptools.
+    # uvloop has no win32 wheels, so fall back to uvicorn's auto loop
+    # there (the Windows installer launches the backend this way).
+    # Set RELOAD=1 for the single-worker auto-reload dev setup.
+    reload = bool(int(os.getenv("RELOAD", "0")))
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        workers=1 if reload else int(os.getenv("WORKERS", os.cpu_count() or 1)),
+        loop="uvloop" if sys.platform != "win32" else "auto",
+        http="httptools",
+        reload=reload
     )
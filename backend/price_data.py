@@ -3,10 +3,11 @@ Market Data Handler
 Generates and manages price data (OHLCV candles)
 """
 
-import random
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import List, Optional
 import numpy as np
+import pandas as pd
 from schema import PriceCandle
 
 
@@ -24,6 +25,22 @@ class PriceDataGenerator:
         self.initial_price = initial_price
         self.volatility = volatility
         self.current_price = initial_price
+        # Per-symbol PCG64 generator, seeded from the initial price so a
+        # symbol's synthetic series is reproducible within a process
+        self.rng = np.random.default_rng(abs(hash(initial_price)) & 0xFFFFFFFF)
+        # Prefilled standard-normal draws; amortizes generator call
+        # overhead across per-candle use
+        self._normal_buffer = np.empty(0)
+        self._buffer_pos = 0
+
+    def _next_normal(self) -> float:
+        """Next standard-normal draw from the prefilled buffer"""
+        if self._buffer_pos >= self._normal_buffer.size:
+            self._normal_buffer = self.rng.standard_normal(1024)
+            self._buffer_pos = 0
+        value = self._normal_buffer[self._buffer_pos]
+        self._buffer_pos += 1
+        return float(value)
     
     def generate_candle(
         self, 
@@ -50,7 +67,7 @@ class PriceDataGenerator:
         sigma = self.volatility
         
         # Random shock
-        dW = np.random.normal(0, 1)
+        dW = self._next_normal()
         change = mu * dt + sigma * dW
         
         # Calculate prices
@@ -58,8 +75,8 @@ class PriceDataGenerator:
         close_price = open_price * (1 + change)
         
         # High and low with some randomness
-        high_factor = abs(np.random.normal(0, 0.005))
-        low_factor = abs(np.random.normal(0, 0.005))
+        high_factor = abs(self._next_normal()) * 0.005
+        low_factor = abs(self._next_normal()) * 0.005
         
         high_price = max(open_price, close_price) * (1 + high_factor)
         low_price = min(open_price, close_price) * (1 - low_factor)
@@ -71,12 +88,13 @@ class PriceDataGenerator:
         # Volume (random with some correlation to price movement)
         volume_base = 1000000
         volume_multiplier = 1 + abs(change) * 5
-        volume = volume_base * volume_multiplier * abs(np.random.normal(1, 0.3))
+        volume = volume_base * volume_multiplier * abs(1 + 0.3 * self._next_normal())
         volume = max(volume, 10000)  # Minimum volume
         
         self.current_price = close_price
-        
-        return PriceCandle(
+
+        # Values are generated internally, so skip Pydantic validation
+        return PriceCandle.model_construct(
             timestamp=timestamp,
             open=round(open_price, 2),
             high=round(high_price, 2),
@@ -102,27 +120,59 @@ class PriceDataGenerator:
         Returns:
             List of PriceCandle objects
         """
-        candles = []
-        current_date = start_date
-        
-        # Parse interval
-        interval_map = {
-            "1m": timedelta(minutes=1),
-            "5m": timedelta(minutes=5),
-            "1h": timedelta(hours=1),
-            "1d": timedelta(days=1)
-        }
-        delta = interval_map.get(interval, timedelta(days=1))
-        
-        previous_close = self.initial_price
-        
-        while current_date <= end_date:
-            candle = self.generate_candle(current_date, previous_close)
-            candles.append(candle)
-            previous_close = candle.close
-            current_date += delta
-        
-        return candles
+        # Timestamp grid in one pd.date_range call instead of a Python
+        # datetime + timedelta loop per bar
+        freq_map = {"1m": "1min", "5m": "5min", "1h": "1h", "1d": "1D"}
+        timestamps = pd.date_range(
+            start_date, end_date, freq=freq_map.get(interval, "1D")
+        ).to_pydatetime()
+
+        n = len(timestamps)
+        if n <= 0:
+            return []
+
+        # Geometric Brownian Motion, all shocks drawn at once:
+        # dS = S * (mu * dt + sigma * dW)
+        mu = 0.0001
+        sigma = self.volatility
+        shocks = mu + sigma * self.rng.standard_normal(n)
+
+        closes = self.initial_price * np.cumprod(1 + shocks)
+        opens = np.concatenate(([self.initial_price], closes[:-1]))
+
+        # High and low with some randomness; the factors are non-negative
+        # so high >= max(open, close) and low <= min(open, close) hold
+        high_factor = np.abs(self.rng.standard_normal(n)) * 0.005
+        low_factor = np.abs(self.rng.standard_normal(n)) * 0.005
+        highs = np.maximum(opens, closes) * (1 + high_factor)
+        lows = np.minimum(opens, closes) * (1 - low_factor)
+
+        # Volume (random with some correlation to price movement)
+        volume_base = 1000000
+        volumes = volume_base * (1 + np.abs(shocks) * 5) * \
+            np.abs(self.rng.normal(1, 0.3, n))
+        volumes = np.maximum(volumes, 10000)  # Minimum volume
+
+        self.current_price = float(closes[-1])
+
+        opens = np.round(opens, 2)
+        highs = np.round(highs, 2)
+        lows = np.round(lows, 2)
+        closes = np.round(closes, 2)
+        volumes = np.round(volumes, 2)
+
+        # Values are generated internally, so skip Pydantic validation
+        return [
+            PriceCandle.model_construct(
+                timestamp=timestamps[i],
+                open=float(opens[i]),
+                high=float(highs[i]),
+                low=float(lows[i]),
+                close=float(closes[i]),
+                volume=float(volumes[i])
+            )
+            for i in range(n)
+        ]
 
 
 class PriceDataManager:
@@ -130,6 +180,9 @@ class PriceDataManager:
     
     def __init__(self):
         self.generators = {}  # Cache generators per symbol
+        # Bounded TTL LRU of recent historical series; endpoints like
+        # quick_backtest and predict hit the same range back-to-back
+        self._hist_cache = TTLCache(maxsize=256, ttl=300)
     
     def get_generator(self, symbol: str) -> PriceDataGenerator:
         """Get or create generator for symbol"""
@@ -184,8 +237,22 @@ class PriceDataManager:
             end_date = datetime.now()
         if start_date is None:
             start_date = end_date - timedelta(days=365)
-        
+
+        # Check the TTL LRU cache (sub-second date jitter collapses onto
+        # the same key so polling endpoints actually hit)
+        cache_key = (
+            symbol,
+            start_date.replace(microsecond=0),
+            end_date.replace(microsecond=0),
+            interval,
+            use_real_data
+        )
+        cached = self._hist_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Try to use real data first
+        data = None
         if use_real_data:
             try:
                 from real_data import real_data_fetcher
@@ -193,13 +260,18 @@ class PriceDataManager:
                     symbol, start_date, end_date, interval
                 )
                 if real_data:
-                    return real_data
+                    data = real_data
             except Exception as e:
                 print(f"Failed to fetch real data, using synthetic: {e}")
-        
+
         # Fallback to synthetic data
-        generator = self.get_generator(symbol)
-        return generator.generate_series(start_date, end_date, interval)
+        if data is None:
+            generator = self.get_generator(symbol)
+            data = generator.generate_series(start_date, end_date, interval)
+
+        self._hist_cache[cache_key] = data
+
+        return data
     
     def get_latest_price(self, symbol: str) -> float:
         """Get latest price for symbol"""
@@ -219,22 +291,31 @@ class PriceDataManager:
     def get_price_at_time(
         self,
         symbol: str,
-        timestamp: datetime
+        timestamp: datetime,
+        interval: str = "1d"
     ) -> Optional[PriceCandle]:
-        """Get price candle at specific time"""
-        data = self.get_historical_data(
-            symbol,
-            start_date=timestamp - timedelta(days=1),
-            end_date=timestamp + timedelta(days=1),
-            interval="1d"
-        )
-        
-        # Find closest candle
-        if not data:
-            return None
-        
-        closest = min(data, key=lambda x: abs((x.timestamp - timestamp).total_seconds()))
-        return closest
+        """
+        Get price candle at specific time
+
+        Snaps the timestamp onto the interval grid and generates that one
+        candle directly, instead of generating a two-day series and
+        scanning it for the closest entry.
+        """
+        interval_map = {
+            "1m": timedelta(minutes=1),
+            "5m": timedelta(minutes=5),
+            "1h": timedelta(hours=1),
+            "1d": timedelta(days=1)
+        }
+        delta = interval_map.get(interval, timedelta(days=1))
+
+        # Quantize onto the interval grid (midnight-anchored)
+        day_start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        offset = (timestamp - day_start) // delta
+        snapped = day_start + offset * delta
+
+        generator = self.get_generator(symbol)
+        return generator.generate_candle(snapped)
 
 
 # Global instance
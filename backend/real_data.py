@@ -3,18 +3,154 @@ Real Stock Data Integration
 Uses yfinance to fetch real market data for any symbol
 """
 
+import asyncio
+import httpx
+import numpy as np
+import pandas as pd
 import yfinance as yf
+from cachetools import TTLCache
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Optional
 from schema import PriceCandle
 
 
+# Crypto symbols that need the -USD suffix for yfinance
+_CRYPTO = frozenset({'BTC', 'ETH', 'BNB', 'ADA', 'SOL', 'DOT', 'DOGE'})
+
+# Yahoo's chart endpoint, hit directly for latest-price polling
+_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range=1d&interval=1d"
+
+# Symbol universe for autocomplete, indexed once at import time
+_SYMBOLS = (
+    'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'META', 'NVDA', 'TSLA', 'NFLX',
+    'JPM', 'BAC', 'WFC', 'GS', 'WMT', 'HD', 'MCD', 'SBUX',
+    'JNJ', 'PFE', 'UNH', 'XOM', 'CVX', 'BA', 'CAT'
+)
+
+# 2-gram postings: each lookup intersects a few small sets instead of
+# scanning the whole universe per request
+_SYMBOL_INDEX: dict = {}
+for _s in _SYMBOLS:
+    for _i in range(len(_s) - 1):
+        _SYMBOL_INDEX.setdefault(_s[_i:_i + 2], set()).add(_s)
+
+
+@lru_cache(maxsize=1024)
+def _search_symbols(query_upper: str) -> tuple:
+    """Match symbols containing query_upper, in universe order (max 10)"""
+    if len(query_upper) < 2:
+        return tuple(s for s in _SYMBOLS if query_upper in s)[:10]
+
+    # Candidates must contain every 2-gram of the query
+    candidates = None
+    for i in range(len(query_upper) - 1):
+        postings = _SYMBOL_INDEX.get(query_upper[i:i + 2])
+        if not postings:
+            return ()
+        candidates = postings if candidates is None else candidates & postings
+
+    # Confirm as substring matches (2-grams can match out of order)
+    return tuple(
+        s for s in _SYMBOLS if s in candidates and query_upper in s
+    )[:10]
+
+
 class RealDataFetcher:
     """Fetch real stock data from Yahoo Finance"""
-    
+
     def __init__(self):
-        self.cache = {}  # Simple cache to avoid repeated API calls
-        self.cache_duration = timedelta(minutes=5)  # Cache for 5 minutes
+        # Bounded TTL caches: entries expire after their ttl and the
+        # least recently used are evicted at capacity, so a long-running
+        # process can't accumulate stale candle lists without limit
+        self.cache = TTLCache(maxsize=512, ttl=300)  # historical fetches
+        self._latest_cache = TTLCache(maxsize=256, ttl=1)  # yf symbol -> candle
+        self._inflight = {}  # cache_key -> Future for requests being fetched
+        self._http_client = None  # Shared AsyncClient, created lazily
+
+    async def get_historical_data_async(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        interval: str = "1d"
+    ) -> List[PriceCandle]:
+        """
+        Async wrapper around get_historical_data
+
+        Runs the blocking yfinance call in a worker thread so the event
+        loop stays free, and collapses concurrent requests for the same
+        (symbol, range, interval) onto a single in-flight fetch.
+        """
+        cache_key = f"{symbol}_{start_date}_{end_date}_{interval}"
+
+        # Wait on an already in-flight fetch for the same key
+        existing = self._inflight.get(cache_key)
+        if existing is not None:
+            return await existing
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[cache_key] = future
+        try:
+            data = await asyncio.to_thread(
+                self.get_historical_data, symbol, start_date, end_date, interval
+            )
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved for the no-waiter case
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared long-lived AsyncClient (connection pool + HTTP/2)"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(http2=True, timeout=3.0)
+        return self._http_client
+
+    async def get_latest_price_async(self, symbol: str) -> Optional[PriceCandle]:
+        """
+        Get latest price for a symbol without blocking the event loop
+
+        Hits Yahoo's chart endpoint directly over a shared HTTP/2 client,
+        skipping yfinance's session setup and DataFrame construction per
+        poll. Responses are cached for one second so UI-tick polling of
+        the same symbol costs a dict probe. Falls back to the yfinance
+        path on any error.
+        """
+        upper = symbol.upper()
+        yf_symbol = f"{upper}-USD" if upper in _CRYPTO else symbol
+
+        cached = self._latest_cache.get(yf_symbol)
+        if cached is not None:
+            return cached
+
+        try:
+            client = self._get_http_client()
+            response = await client.get(_CHART_URL.format(symbol=yf_symbol))
+            response.raise_for_status()
+
+            result = response.json()['chart']['result'][0]
+            quote = result['indicators']['quote'][0]
+
+            candle = PriceCandle.model_construct(
+                timestamp=datetime.fromtimestamp(result['timestamp'][-1]),
+                open=float(quote['open'][-1]),
+                high=float(quote['high'][-1]),
+                low=float(quote['low'][-1]),
+                close=float(quote['close'][-1]),
+                volume=float(quote['volume'][-1] or 0.0)
+            )
+
+            self._latest_cache[yf_symbol] = candle
+            return candle
+
+        except Exception as e:
+            print(f"Chart endpoint failed for {symbol}, falling back to yfinance: {e}")
+            return await asyncio.to_thread(self.get_latest_price, symbol)
     
     def get_historical_data(
         self,
@@ -38,15 +174,15 @@ class RealDataFetcher:
         try:
             # Normalize symbol for yfinance
             # Crypto symbols need -USD suffix
-            if symbol.upper() in ['BTC', 'ETH', 'BNB', 'ADA', 'SOL', 'DOT', 'DOGE']:
-                symbol = f"{symbol.upper()}-USD"
+            upper = symbol.upper()
+            if upper in _CRYPTO:
+                symbol = f"{upper}-USD"
             
-            # Check cache
+            # Check cache (TTLCache handles expiry and eviction)
             cache_key = f"{symbol}_{start_date}_{end_date}_{interval}"
-            if cache_key in self.cache:
-                cached_data, cached_time = self.cache[cache_key]
-                if datetime.now() - cached_time < self.cache_duration:
-                    return cached_data
+            cached_data = self.cache.get(cache_key)
+            if cached_data is not None:
+                return cached_data
             
             # Set default dates if not provided
             if end_date is None:
@@ -81,23 +217,12 @@ class RealDataFetcher:
             if hist.empty:
                 print(f"No data found for {symbol}, using fallback")
                 return self._get_fallback_data(symbol, start_date, end_date, interval)
-            
-            # Convert to PriceCandle objects
-            candles = []
-            for timestamp, row in hist.iterrows():
-                candle = PriceCandle(
-                    timestamp=timestamp.to_pydatetime() if hasattr(timestamp, 'to_pydatetime') else timestamp,
-                    open=float(row['Open']),
-                    high=float(row['High']),
-                    low=float(row['Low']),
-                    close=float(row['Close']),
-                    volume=float(row['Volume']) if 'Volume' in row else 0.0
-                )
-                candles.append(candle)
-            
+
+            candles = self._hist_to_candles(hist)
+
             # Cache the result
-            self.cache[cache_key] = (candles, datetime.now())
-            
+            self.cache[cache_key] = candles
+
             return candles
             
         except Exception as e:
@@ -105,6 +230,122 @@ class RealDataFetcher:
             # Fallback to synthetic data
             return self._get_fallback_data(symbol, start_date, end_date, interval)
     
+    def _hist_to_candles(self, hist) -> List[PriceCandle]:
+        """
+        Convert a yfinance history DataFrame to PriceCandle objects
+
+        Pulls all columns out in one to_numpy() call instead of
+        iterrows(), which pays pandas row-construction overhead per bar,
+        and skips Pydantic validation since the values come from the
+        upstream feed unchanged.
+        """
+        timestamps = hist.index.to_pydatetime()
+        if 'Volume' in hist.columns:
+            arr = hist[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float)
+        else:
+            arr = hist[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=float)
+            arr = np.column_stack([arr, np.zeros(len(arr))])
+
+        return [
+            PriceCandle.model_construct(
+                timestamp=t,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=v
+            )
+            for t, (o, h, l, c, v) in zip(timestamps, arr.tolist())
+        ]
+
+    def get_batch_historical_data(
+        self,
+        symbols: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        interval: str = "1d"
+    ) -> dict:
+        """
+        Fetch historical data for several symbols in one yfinance call
+
+        yf.download requests all tickers concurrently, so an N-symbol
+        fetch costs roughly one round trip instead of N.
+
+        Args:
+            symbols: Stock symbols
+            start_date: Start date
+            end_date: End date
+            interval: Time interval
+
+        Returns:
+            Dictionary of requested symbol -> List[PriceCandle]
+        """
+        if end_date is None:
+            end_date = datetime.now()
+        if start_date is None:
+            start_date = end_date - timedelta(days=365)
+
+        interval_map = {"1m": "1m", "5m": "5m", "1h": "1h", "1d": "1d"}
+        yf_interval = interval_map.get(interval, "1d")
+
+        # Normalize crypto symbols, remembering the requested names
+        yf_symbols = []
+        for symbol in symbols:
+            upper = symbol.upper()
+            yf_symbols.append(f"{upper}-USD" if upper in _CRYPTO else symbol)
+
+        try:
+            data = yf.download(
+                " ".join(yf_symbols),
+                start=start_date,
+                end=end_date,
+                interval=yf_interval,
+                group_by='ticker',
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            print(f"Batch download failed: {e}")
+            data = None
+
+        result = {}
+        for symbol, yf_symbol in zip(symbols, yf_symbols):
+            candles = None
+            if data is not None and not data.empty:
+                try:
+                    # yfinance returns a ticker column level whenever the
+                    # columns are a MultiIndex -- with multi_level_index
+                    # enabled that includes single-symbol downloads, so key
+                    # on the frame shape rather than the symbol count
+                    if isinstance(data.columns, pd.MultiIndex):
+                        hist = data[yf_symbol].dropna()
+                    else:
+                        hist = data.dropna()
+                    if not hist.empty:
+                        candles = self._hist_to_candles(hist)
+                except KeyError:
+                    candles = None
+
+            if candles is None:
+                print(f"No batch data for {symbol}, using fallback")
+                result[symbol] = self._get_fallback_data(symbol, start_date, end_date, interval)
+            else:
+                result[symbol] = candles
+
+        return result
+
+    async def get_batch_historical_data_async(
+        self,
+        symbols: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        interval: str = "1d"
+    ) -> dict:
+        """Async wrapper around get_batch_historical_data (thread offload)"""
+        return await asyncio.to_thread(
+            self.get_batch_historical_data, symbols, start_date, end_date, interval
+        )
+
     def _get_fallback_data(
         self,
         symbol: str,
@@ -120,8 +361,9 @@ class RealDataFetcher:
         """Get latest price for a symbol"""
         try:
             # Normalize symbol
-            if symbol.upper() in ['BTC', 'ETH', 'BNB', 'ADA', 'SOL', 'DOT', 'DOGE']:
-                symbol = f"{symbol.upper()}-USD"
+            upper = symbol.upper()
+            if upper in _CRYPTO:
+                symbol = f"{upper}-USD"
             
             ticker = yf.Ticker(symbol)
             hist = ticker.history(period="1d", interval="1d")
@@ -132,7 +374,8 @@ class RealDataFetcher:
             latest = hist.iloc[-1]
             latest_timestamp = hist.index[-1]
             
-            return PriceCandle(
+            # Values come straight from the feed, skip Pydantic validation
+            return PriceCandle.model_construct(
                 timestamp=latest_timestamp.to_pydatetime() if hasattr(latest_timestamp, 'to_pydatetime') else datetime.now(),
                 open=float(latest['Open']),
                 high=float(latest['High']),
@@ -148,19 +391,12 @@ class RealDataFetcher:
         """
         Search for symbols (basic implementation)
         In production, you'd use a proper symbol search API
+
+        Lookups run against the module-level 2-gram index and are
+        memoized per query, so repeated autocomplete hits cost a cache
+        probe rather than a scan.
         """
-        # This is a simple implementation
-        # For production, integrate with a symbol search API
-        common_symbols = [
-            'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'META', 'NVDA', 'TSLA', 'NFLX',
-            'JPM', 'BAC', 'WFC', 'GS', 'WMT', 'HD', 'MCD', 'SBUX',
-            'JNJ', 'PFE', 'UNH', 'XOM', 'CVX', 'BA', 'CAT'
-        ]
-        
-        query_upper = query.upper()
-        matches = [s for s in common_symbols if query_upper in s]
-        
-        return [{'symbol': s, 'name': s} for s in matches[:10]]
+        return [{'symbol': s, 'name': s} for s in _search_symbols(query.upper())]
 
 
 # Global instance
